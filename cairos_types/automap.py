@@ -0,0 +1,315 @@
+import re
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import NamedTuple, Sequence
+
+import numpy as np
+
+from cairos_types.skeleton import (CairosWorkSkelMapping,
+                                   CairosWorkSkelJoint,
+                                   CairosWorkSkelIndexMapping,
+                                   WORK_SKEL_JOINT_COUNT)
+
+# Automatic mapping of user skeletons to the work skeleton. Every joint name
+# (user and work skeleton alike) is normalized into a side (left/right/none), a
+# trailing digit and a "core" name. The core names are embedded as hashed
+# character n-gram vectors, so scoring every user joint against every work
+# skeleton joint is a single matrix product. The final mapping is the
+# assignment that maximizes the total score.
+
+_FEATURE_DIM = 1024
+_NGRAM = 3
+
+# namespaces like `mixamorig:` or `Armature|` are stripped entirely, these are
+# common prefixes that rigging tools add without a separator
+_KNOWN_PREFIXES = ('mixamorig', 'bip01', 'bip001', 'ccbase', 'def', 'org', 'mch', 'jnt', 'bn', 'b')
+
+_LEFT_TOKENS = {'l', 'left', 'lf', 'lft'}
+_RIGHT_TOKENS = {'r', 'right', 'rt', 'rgt'}
+
+_TOKEN_RE = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+')
+
+# alternative names for the work skeleton joints, as they appear in other
+# common rigs. The work skeleton name itself is always a candidate.
+_ALIASES: dict[str, tuple[str, ...]] = {
+    'Reference': ('root', 'reference'),
+    'Hips': ('pelvis', 'hip', 'hips', 'cog'),
+    'UpLeg': ('thigh', 'upperleg', 'upleg'),
+    'Leg': ('calf', 'shin', 'knee', 'lowerleg'),
+    'Foot': ('foot', 'ankle'),
+    'ToeBase': ('toe', 'toes', 'ball'),
+    'Shoulder': ('clavicle', 'collar', 'shoulder'),
+    'Arm': ('upperarm', 'arm'),
+    'ForeArm': ('forearm', 'lowerarm', 'elbow'),
+    'HandPalm': ('hand', 'wrist', 'palm'),
+    'HandThumb': ('thumb', 'handthumb'),
+    'HandIndex': ('index', 'handindex', 'pointer'),
+    'HandMid': ('middle', 'handmiddle', 'mid'),
+    'HandRing': ('ring', 'handring'),
+    'HandPinky': ('pinky', 'handpinky', 'little', 'small'),
+    'Spine': ('spine', 'chest', 'torso'),
+    'Neck': ('neck',),
+    'Head': ('head',),
+}
+
+@dataclass(frozen=True)
+class JointNameFeatures:
+    # -1 for left, 1 for right, 0 for joints without a side
+    side: int
+    # trailing number of the joint name, -1 if there is none
+    digit: int
+    core: str
+
+def _tokenize(name: str) -> list[str]:
+    # strip namespaces and DAG paths
+    name = re.split(r'[:|/]', name)[-1]
+    tokens = [t.lower() for t in _TOKEN_RE.findall(name)]
+
+    while len(tokens) > 1 and tokens[0] in _KNOWN_PREFIXES:
+        tokens = tokens[1:]
+
+    # `CC_Base_` and similar prefixes are split over several tokens
+    if len(tokens) > 2 and tokens[0] + tokens[1] in _KNOWN_PREFIXES:
+        tokens = tokens[2:]
+
+    return tokens
+
+def normalize_joint_name(name: str) -> JointNameFeatures:
+    tokens = _tokenize(name)
+
+    side = 0
+    remaining = []
+    for token in tokens:
+        if side == 0 and token in _LEFT_TOKENS:
+            side = -1
+        elif side == 0 and token in _RIGHT_TOKENS:
+            side = 1
+        else:
+            remaining.append(token)
+
+    digit = -1
+    if len(remaining) > 1 and remaining[-1].isdigit():
+        digit = int(remaining.pop())
+
+    # digits in the middle of a name (e.g. `spine01_end`) are kept in the core
+    return JointNameFeatures(side=side, digit=digit, core=''.join(remaining))
+
+def _embed(cores: Sequence[str]) -> np.ndarray:
+    vectors = np.zeros((len(cores), _FEATURE_DIM), dtype=np.float32)
+
+    for row, core in enumerate(cores):
+        padded = f'^{core}$'
+        for i in range(max(len(padded) - _NGRAM + 1, 1)):
+            vectors[row, zlib.crc32(padded[i:i + _NGRAM].encode()) % _FEATURE_DIM] += 1.0
+
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+def _aliases_for(joint: str) -> tuple[str, ...]:
+    features = normalize_joint_name(joint)
+    for key, aliases in _ALIASES.items():
+        if features.core == normalize_joint_name(key).core:
+            return (features.core,) + aliases
+    return (features.core,)
+
+def _linear_sum_assignment(cost: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Hungarian algorithm (shortest augmenting paths with potentials) for a
+    # rectangular cost matrix, minimizing the total cost. Returns row and column
+    # indices of the assignment, sorted by row.
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    # p[j] is the row (1-based) assigned to column j, 0 when unassigned
+    p = np.zeros(m + 1, dtype=np.int64)
+    way = np.zeros(m + 1, dtype=np.int64)
+
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+
+            improved = free & (reduced < minv[1:])
+            minv[1:][improved] = reduced[improved]
+            way[1:][improved] = j0
+
+            candidates = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+
+            u[p[used]] += delta
+            v[used] -= delta
+            minv[1:][free] -= delta
+
+            j0 = j1
+            if p[j0] == 0:
+                break
+
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    cols = np.nonzero(p[1:])[0]
+    rows = p[1:][cols] - 1
+
+    if transposed:
+        rows, cols = cols, rows
+
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+@dataclass(frozen=True)
+class AutoMapResult:
+    mapping: CairosWorkSkelMapping
+    index_mapping: CairosWorkSkelIndexMapping
+    # per work skeleton joint, in `CairosWorkSkelJoint` order. Unmapped joints
+    # have a confidence of 0.
+    confidence: np.ndarray
+
+    def confidence_by_joint(self) -> dict[str, float]:
+        return {joint.name: float(c) for joint, c in zip(CairosWorkSkelJoint, self.confidence)}
+
+class FeatureCacheInfo(NamedTuple):
+    names: int
+    vectors: int
+    maxsize: int
+
+def _remember(cache: OrderedDict, entries: dict, maxsize: int):
+    for key, value in entries.items():
+        cache[key] = value
+        cache.move_to_end(key)
+    while len(cache) > maxsize:
+        cache.popitem(last=False)
+
+class SkeletonAutoMapper:
+    # Maps user skeletons to `CairosWorkSkelMapping`. The work skeleton features
+    # are computed once per mapper. Normalized features of user joint names are
+    # cached by name and their vectors by normalized core name, so mapping
+    # batches of avatars with similar rigs (even with different namespaces)
+    # only embeds every distinct core name once. Both caches keep at most
+    # `cache_size` entries, the least recently used are dropped first.
+
+    def __init__(self, min_confidence: float = 0.5, cache_size: int = 4096):
+        if cache_size < 1:
+            raise ValueError('cache_size should be at least 1.')
+
+        self.min_confidence = min_confidence
+        self.cache_size = cache_size
+
+        alias_features: list[JointNameFeatures] = []
+        alias_owner: list[int] = []
+        for joint in CairosWorkSkelJoint:
+            work = normalize_joint_name(joint.name)
+            for alias in _aliases_for(joint.name):
+                alias_features.append(JointNameFeatures(work.side, work.digit, alias))
+                alias_owner.append(int(joint))
+
+        self._alias_vectors = _embed([f.core for f in alias_features])
+        self._alias_side = np.array([f.side for f in alias_features], dtype=np.int8)
+        self._alias_digit = np.array([f.digit for f in alias_features], dtype=np.int32)
+        # aliases are contiguous per joint, so scores can be reduced with
+        # `np.maximum.reduceat` over these offsets
+        self._alias_offsets = np.searchsorted(np.array(alias_owner), np.arange(WORK_SKEL_JOINT_COUNT))
+
+        self._name_features: OrderedDict[str, JointNameFeatures] = OrderedDict()
+        self._core_vectors: OrderedDict[str, np.ndarray] = OrderedDict()
+
+    def cache_info(self) -> FeatureCacheInfo:
+        return FeatureCacheInfo(len(self._name_features), len(self._core_vectors), self.cache_size)
+
+    def cache_clear(self):
+        self._name_features.clear()
+        self._core_vectors.clear()
+
+    def _user_features(self, joints: Sequence[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # features of this call are collected locally first, so that eviction
+        # cannot drop entries that are still needed
+        features = {}
+        for joint in dict.fromkeys(joints):
+            cached = self._name_features.get(joint)
+            features[joint] = cached if cached is not None else normalize_joint_name(joint)
+
+        vectors = {}
+        missing = []
+        for core in dict.fromkeys(f.core for f in features.values()):
+            cached = self._core_vectors.get(core)
+            if cached is None:
+                missing.append(core)
+            else:
+                vectors[core] = cached
+        if missing:
+            vectors.update(zip(missing, _embed(missing)))
+
+        _remember(self._name_features, features, self.cache_size)
+        _remember(self._core_vectors, vectors, self.cache_size)
+
+        joint_features = [features[j] for j in joints]
+        if joint_features:
+            user_vectors = np.stack([vectors[f.core] for f in joint_features])
+        else:
+            user_vectors = np.zeros((0, _FEATURE_DIM), dtype=np.float32)
+        sides = np.array([f.side for f in joint_features], dtype=np.int8)
+        digits = np.array([f.digit for f in joint_features], dtype=np.int32)
+        return user_vectors, sides, digits
+
+    def similarity(self, joints: Sequence[str]) -> np.ndarray:
+        # Returns a (user joints, work skeleton joints) matrix of scores in
+        # [0, 1].
+        vectors, sides, digits = self._user_features(joints)
+        if len(joints) == 0:
+            return np.zeros((0, WORK_SKEL_JOINT_COUNT), dtype=np.float32)
+
+        scores = vectors @ self._alias_vectors.T
+
+        # opposite sides never match, a missing side on a sided joint is
+        # heavily penalized
+        side_user = sides[:, None]
+        side_work = self._alias_side[None, :]
+        side_factor = np.where(side_user == side_work, 1.0,
+                               np.where((side_user == 0) | (side_work == 0), 0.3, 0.0))
+
+        digit_user = digits[:, None]
+        digit_work = self._alias_digit[None, :]
+        digit_factor = np.where(digit_user == digit_work, 1.0,
+                                np.where((digit_user == -1) | (digit_work == -1), 0.8, 0.4))
+
+        scores = scores * side_factor * digit_factor
+        return np.maximum.reduceat(scores, self._alias_offsets, axis=1)
+
+    def map(self, joints: Sequence[str]) -> AutoMapResult:
+        joints = list(joints)
+        scores = self.similarity(joints)
+
+        indices = np.full(WORK_SKEL_JOINT_COUNT, -1, dtype=np.int32)
+        confidence = np.zeros(WORK_SKEL_JOINT_COUNT, dtype=np.float32)
+
+        if len(joints) > 0:
+            rows, cols = _linear_sum_assignment(-scores)
+            accepted = scores[rows, cols] >= self.min_confidence
+            indices[cols[accepted]] = rows[accepted]
+            confidence[cols[accepted]] = scores[rows[accepted], cols[accepted]]
+
+        index_mapping = CairosWorkSkelIndexMapping(joints, indices)
+        return AutoMapResult(
+            mapping=index_mapping.to_mapping(),
+            index_mapping=index_mapping,
+            confidence=confidence)
+
+    def map_batch(self, skeletons: Sequence[Sequence[str]]) -> list[AutoMapResult]:
+        # embed all distinct names of the batch at once before solving the
+        # individual assignments
+        self._user_features([j for joints in skeletons for j in joints])
+        return [self.map(joints) for joints in skeletons]
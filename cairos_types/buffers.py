@@ -0,0 +1,192 @@
+import struct
+import sys
+from multiprocessing import resource_tracker, shared_memory
+from typing import Literal, Protocol, Sequence
+
+from pydantic.v1 import BaseModel, root_validator
+
+# Out-of-band transport of binary payloads (e.g. an `AvatarMapping` given as
+# bytes, or avatar blobs). Instead of embedding the bytes in the JSON message,
+# the message carries a `BufferRef` and the binary part travels either as a
+# separate frame of the same message or in a shared memory segment. The
+# receiving side gets a `memoryview` of the payload without copying it.
+#
+# Sending with frames:
+#
+#   buffers = FrameBuffers()
+#   ref = buffers.add(payload)
+#   frames = encode_frames(message_with_ref, buffers)
+#
+# Receiving:
+#
+#   envelope, buffers = decode_frames(frames)
+#   payload = buffers.resolve(ref)
+
+class BufferRef(BaseModel):
+    transport: Literal['frame', 'shm']
+    # index of the payload frame (after the envelope) for the `frame` transport
+    index: int | None = None
+    # name of the shared memory segment for the `shm` transport
+    shm_name: str | None = None
+    offset: int = 0
+    length: int
+
+    @root_validator
+    def check_location(cls, values):
+        transport = values.get('transport')
+        if transport == 'frame' and values.get('index') is None:
+            raise ValueError('Buffer references with the frame transport need a frame index.')
+        if transport == 'shm' and not values.get('shm_name'):
+            raise ValueError('Buffer references with the shm transport need a shared memory name.')
+        if values.get('offset', 0) < 0 or values.get('length', 0) < 0:
+            raise ValueError('Buffer offset and length cannot be negative.')
+        return values
+
+class BufferSource(Protocol):
+    def resolve(self, ref: BufferRef) -> memoryview: ...
+
+def _slice(buffer: memoryview, ref: BufferRef) -> memoryview:
+    if ref.offset + ref.length > buffer.nbytes:
+        raise ValueError(f'Buffer reference {ref.offset}+{ref.length} exceeds the buffer size {buffer.nbytes}.')
+    return buffer[ref.offset:ref.offset + ref.length]
+
+class FrameBuffers:
+    # Payload frames of a message. On the sending side payloads are added
+    # without copying, on the receiving side they are the frames that followed
+    # the envelope.
+    def __init__(self, frames: Sequence[bytes | bytearray | memoryview] = ()):
+        self.frames: list[memoryview] = [memoryview(f).cast('B') for f in frames]
+
+    def add(self, data: bytes | bytearray | memoryview) -> BufferRef:
+        frame = memoryview(data).cast('B')
+        self.frames.append(frame)
+        return BufferRef(transport='frame', index=len(self.frames) - 1, length=frame.nbytes)
+
+    def resolve(self, ref: BufferRef) -> memoryview:
+        if ref.transport != 'frame':
+            raise ValueError(f'Cannot resolve a buffer with the {ref.transport} transport from message frames.')
+        if not 0 <= ref.index < len(self.frames):
+            raise ValueError(f'Message has no payload frame {ref.index}.')
+        return _slice(self.frames[ref.index], ref)
+
+def encode_frames(message: BaseModel, buffers: FrameBuffers) -> list[bytes | memoryview]:
+    # The JSON envelope followed by the payload frames, for transports that
+    # support multipart messages.
+    return [message.json().encode(), *buffers.frames]
+
+def decode_frames(frames: Sequence[bytes | bytearray | memoryview]) -> tuple[bytes | bytearray | memoryview, FrameBuffers]:
+    if not frames:
+        raise ValueError('A message needs at least an envelope frame.')
+    return frames[0], FrameBuffers(frames[1:])
+
+_FRAME_HEADER = struct.Struct('!I')
+_FRAME_LENGTH = struct.Struct('!Q')
+
+def pack_frames(frames: Sequence[bytes | bytearray | memoryview]) -> bytes:
+    # Single message body for transports without multipart messages (e.g. an
+    # AMQP message body): frame count, then every frame prefixed by its length.
+    # The payloads are copied once into the body, never encoded.
+    parts = [_FRAME_HEADER.pack(len(frames))]
+    for frame in frames:
+        frame = memoryview(frame).cast('B')
+        parts.append(_FRAME_LENGTH.pack(frame.nbytes))
+        parts.append(frame)
+    return b''.join(parts)
+
+def unpack_frames(body: bytes | bytearray | memoryview) -> list[memoryview]:
+    # Frames of a body created by `pack_frames`, as views into `body`.
+    body = memoryview(body).cast('B')
+    if body.nbytes < _FRAME_HEADER.size:
+        raise ValueError('Message body is too short.')
+
+    (count,) = _FRAME_HEADER.unpack_from(body)
+    position = _FRAME_HEADER.size
+    frames = []
+    for _ in range(count):
+        if position + _FRAME_LENGTH.size > body.nbytes:
+            raise ValueError('Message body is truncated.')
+        (length,) = _FRAME_LENGTH.unpack_from(body, position)
+        position += _FRAME_LENGTH.size
+        if position + length > body.nbytes:
+            raise ValueError('Message body is truncated.')
+        frames.append(body[position:position + length])
+        position += length
+
+    if position != body.nbytes:
+        raise ValueError('Message body has trailing data.')
+    return frames
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    # Before Python 3.13 attaching registers the segment with the resource
+    # tracker of this process, which unlinks it when this process exits, even
+    # though the segment belongs to the writer.
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    segment = shared_memory.SharedMemory(name=name)
+    resource_tracker.unregister(segment._name, 'shared_memory')
+    return segment
+
+class SharedMemoryBuffers:
+    # Payloads in shared memory segments, for workers running on the same
+    # host. The writing side owns the segments and unlinks them on `close`,
+    # the reading side only attaches to them. Views returned by `resolve` have
+    # to be released before `close`.
+    def __init__(self):
+        self._segments: dict[str, shared_memory.SharedMemory] = {}
+        self._owned: set[str] = set()
+
+    def put(self, data: bytes | bytearray | memoryview) -> BufferRef:
+        data = memoryview(data).cast('B')
+        segment = shared_memory.SharedMemory(create=True, size=max(data.nbytes, 1))
+        segment.buf[:data.nbytes] = data
+        self._segments[segment.name] = segment
+        self._owned.add(segment.name)
+        return BufferRef(transport='shm', shm_name=segment.name, length=data.nbytes)
+
+    def resolve(self, ref: BufferRef) -> memoryview:
+        if ref.transport != 'shm':
+            raise ValueError(f'Cannot resolve a buffer with the {ref.transport} transport from shared memory.')
+
+        segment = self._segments.get(ref.shm_name)
+        if segment is None:
+            segment = self._segments[ref.shm_name] = _attach(ref.shm_name)
+        return _slice(segment.buf, ref)
+
+    def close(self):
+        # Owned segments are unlinked even when a view of them is still alive
+        # and closing fails, the first such error is raised once every segment
+        # has been handled.
+        error = None
+        for name, segment in self._segments.items():
+            try:
+                segment.close()
+            except BufferError as e:
+                error = error or e
+            finally:
+                if name in self._owned:
+                    self._unlink(segment)
+        self._segments.clear()
+        self._owned.clear()
+        if error is not None:
+            raise error
+
+    @staticmethod
+    def _unlink(segment: shared_memory.SharedMemory):
+        try:
+            segment.unlink()
+        except FileNotFoundError:
+            # already removed by someone else, only stop tracking it
+            if sys.version_info < (3, 13):
+                resource_tracker.unregister(segment._name, 'shared_memory')
+
+    def __enter__(self) -> 'SharedMemoryBuffers':
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        try:
+            self.close()
+        except BufferError:
+            # do not replace the exception raised in the `with` block
+            if exc_type is None:
+                raise
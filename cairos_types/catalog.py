@@ -0,0 +1,159 @@
+import bisect
+import json
+import re
+from datetime import datetime
+from typing import Iterable, Iterator
+
+from cairos_types.core import Motion, Motions
+
+# Indexed alternative to `Motions`. Motions are indexed by `sg_id`, by the
+# tokens of their description, shot description and tags (an inverted index
+# with a sorted token list for prefix lookups) and by creation date. All
+# indices are updated incrementally on `add` and `remove`.
+
+_TOKEN_RE = re.compile(r'\w+')
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+def _motion_tokens(motion: Motion) -> set[str]:
+    tokens = set(tokenize(motion.description))
+    tokens.update(tokenize(motion.shot_description))
+    for tag in motion.tags:
+        tokens.update(tokenize(tag))
+    return tokens
+
+# field order of the columnar snapshot format
+_SNAPSHOT_FIELDS = ('sg_id', 'description', 'input', 'created_at', 'shot_description', 'tags')
+_SNAPSHOT_VERSION = 1
+
+class MotionCatalog:
+    def __init__(self, key: str, motions: Iterable[Motion] = ()):
+        self.key = key
+        self._by_id: dict[int, Motion] = {}
+        self._postings: dict[str, set[int]] = {}
+        # sorted list of all tokens in `_postings`, for prefix lookups
+        self._tokens: list[str] = []
+        # sorted list of (created_at, sg_id)
+        self._by_date: list[tuple[datetime, int]] = []
+
+        for motion in motions:
+            self.add(motion)
+
+    @classmethod
+    def from_motions(cls, motions: Motions) -> 'MotionCatalog':
+        return cls(motions.key, motions.entries)
+
+    def to_motions(self) -> Motions:
+        # entries are already validated, so the model is constructed directly
+        return Motions.construct(key=self.key, entries=list(self._by_id.values()))
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Motion]:
+        return iter(self._by_id.values())
+
+    def __contains__(self, sg_id: int) -> bool:
+        return sg_id in self._by_id
+
+    def get(self, sg_id: int) -> Motion | None:
+        return self._by_id.get(sg_id)
+
+    def add(self, motion: Motion):
+        # adding a motion with an existing `sg_id` replaces the old entry
+        if motion.sg_id in self._by_id:
+            self.remove(motion.sg_id)
+
+        self._by_id[motion.sg_id] = motion
+        for token in _motion_tokens(motion):
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = set()
+                bisect.insort(self._tokens, token)
+            posting.add(motion.sg_id)
+        bisect.insort(self._by_date, (motion.created_at, motion.sg_id))
+
+    def remove(self, sg_id: int) -> Motion:
+        motion = self._by_id.pop(sg_id, None)
+        if motion is None:
+            raise KeyError(f'No motion with id {sg_id} in catalog {self.key}.')
+
+        for token in _motion_tokens(motion):
+            posting = self._postings[token]
+            posting.discard(sg_id)
+            if not posting:
+                del self._postings[token]
+                del self._tokens[bisect.bisect_left(self._tokens, token)]
+
+        del self._by_date[bisect.bisect_left(self._by_date, (motion.created_at, sg_id))]
+        return motion
+
+    def _prefix_ids(self, prefix: str) -> set[int]:
+        ids = set()
+        start = bisect.bisect_left(self._tokens, prefix)
+        for token in self._tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            ids.update(self._postings[token])
+        return ids
+
+    def _sorted_by_date(self, ids: set[int]) -> list[Motion]:
+        return sorted((self._by_id[i] for i in ids), key=lambda m: (m.created_at, m.sg_id))
+
+    def search(self, query: str, prefix: bool = False) -> list[Motion]:
+        # Motions containing every token of `query`, ordered by creation date.
+        # With `prefix` the last token of the query only has to be a prefix of
+        # a token, which is what search-as-you-type needs.
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        postings = [self._postings.get(t, set()) for t in (tokens[:-1] if prefix else tokens)]
+        if prefix:
+            postings.append(self._prefix_ids(tokens[-1]))
+
+        postings.sort(key=len)
+        ids = set(postings[0])
+        for posting in postings[1:]:
+            ids.intersection_update(posting)
+            if not ids:
+                break
+
+        return self._sorted_by_date(ids)
+
+    def search_prefix(self, prefix: str) -> list[Motion]:
+        return self._sorted_by_date(self._prefix_ids(prefix.lower()))
+
+    def created_between(self, start: datetime | None = None, end: datetime | None = None) -> list[Motion]:
+        # motions created in [start, end), ordered by creation date
+        lo = 0 if start is None else bisect.bisect_left(self._by_date, (start,))
+        hi = len(self._by_date) if end is None else bisect.bisect_left(self._by_date, (end,))
+        return [self._by_id[sg_id] for _, sg_id in self._by_date[lo:hi]]
+
+    def to_snapshot(self) -> bytes:
+        # Columnar JSON, one list per `Motion` field. Loading a snapshot skips
+        # validation, so snapshots should only be loaded from trusted storage.
+        motions = list(self._by_id.values())
+        columns = {
+            'sg_id': [m.sg_id for m in motions],
+            'description': [m.description for m in motions],
+            'input': [m.input for m in motions],
+            'created_at': [m.created_at.isoformat() for m in motions],
+            'shot_description': [m.shot_description for m in motions],
+            'tags': [m.tags for m in motions],
+        }
+        return json.dumps({'version': _SNAPSHOT_VERSION, 'key': self.key, 'columns': columns},
+                          separators=(',', ':')).encode()
+
+    @classmethod
+    def from_snapshot(cls, snapshot: bytes | str) -> 'MotionCatalog':
+        data = json.loads(snapshot)
+        if data.get('version') != _SNAPSHOT_VERSION:
+            raise ValueError(f'Unsupported motion catalog snapshot version {data.get("version")}.')
+
+        columns = data['columns']
+        columns['created_at'] = [datetime.fromisoformat(c) for c in columns['created_at']]
+        motions = (Motion.construct(**dict(zip(_SNAPSHOT_FIELDS, values)))
+                   for values in zip(*(columns[f] for f in _SNAPSHOT_FIELDS)))
+        return cls(data['key'], motions)
@@ -1,5 +1,7 @@
-from pydantic.v1 import BaseModel, root_validator
+from pydantic.v1 import BaseModel, PrivateAttr, root_validator
 from datetime import datetime
+from typing import Sequence
+import numpy as np
 import os
 
 class Motion(BaseModel):
@@ -8,6 +10,7 @@ class Motion(BaseModel):
     input: str # filepath of the motion
     created_at: datetime
     shot_description: str
+    tags: list[str] = []
 
     @root_validator(pre=True)
     def check_motion(cls, values):
@@ -35,9 +38,159 @@ class Motions(BaseModel):
     # tool_call_id: str
     entries: list[Motion]
 
+# Frame range of a motion as it is used in a sequence. `frame_end` is
+# exclusive, so the duration of the motion is `frame_end - frame_start`.
+class MotionTiming(BaseModel):
+    frame_start: int = 0
+    frame_end: int
+
+    @root_validator
+    def check_frame_range(cls, values):
+        if 'frame_end' in values and values['frame_end'] <= values.get('frame_start', 0):
+            raise ValueError(f'Motion frame range should not be empty, got {values.get("frame_start")}-{values["frame_end"]}.')
+        return values
+
+    @property
+    def duration(self) -> int:
+        return self.frame_end - self.frame_start
+
+# Index over the clips of a sequence, played back to back. The start frame of
+# every clip is kept in a cumulative offset array, so looking up the clip at a
+# frame or the clips overlapping a frame range are binary searches. Appending a
+# clip is amortized O(1), inserting or removing one shifts the offsets after it
+# without rebuilding the index.
+class TimelineIndex:
+    def __init__(self, durations: Sequence[int] = ()):
+        durations = np.asarray(durations, dtype=np.int64)
+        if (durations <= 0).any():
+            raise ValueError('Clip durations should be positive.')
+
+        self._size = len(durations)
+        # offsets[i] is the start frame of clip i, offsets[size] is the end of
+        # the sequence. The array is over-allocated to make appends cheap.
+        self._offsets = np.zeros(max(16, 2 * (self._size + 1)), dtype=np.int64)
+        np.cumsum(durations, out=self._offsets[1:self._size + 1])
+
+    @property
+    def offsets(self) -> np.ndarray:
+        view = self._offsets[:self._size + 1]
+        view.setflags(write=False)
+        return view
+
+    @property
+    def total_frames(self) -> int:
+        return int(self._offsets[self._size])
+
+    def __len__(self) -> int:
+        return self._size
+
+    def frame_range(self, index: int) -> tuple[int, int]:
+        if not -self._size <= index < self._size:
+            raise IndexError(f'Clip index {index} out of range.')
+        index %= self._size
+        return int(self._offsets[index]), int(self._offsets[index + 1])
+
+    def motion_at(self, frame: int) -> int | None:
+        # index of the clip playing at `frame`, None outside of the sequence
+        if frame < 0 or frame >= self.total_frames:
+            return None
+        return int(np.searchsorted(self.offsets, frame, side='right')) - 1
+
+    def overlapping(self, frame_start: int, frame_end: int) -> range:
+        # indices of the clips overlapping the frame range [frame_start, frame_end)
+        frame_start = max(frame_start, 0)
+        frame_end = min(frame_end, self.total_frames)
+        if frame_start >= frame_end:
+            return range(0)
+
+        offsets = self.offsets
+        first = int(np.searchsorted(offsets, frame_start, side='right')) - 1
+        last = int(np.searchsorted(offsets, frame_end, side='left'))
+        return range(first, last)
+
+    def _reserve(self, size: int):
+        if size + 1 > len(self._offsets):
+            grown = np.zeros(2 * (size + 1), dtype=np.int64)
+            grown[:self._size + 1] = self._offsets[:self._size + 1]
+            self._offsets = grown
+
+    def append(self, duration: int):
+        self.insert(self._size, duration)
+
+    def insert(self, index: int, duration: int):
+        if duration <= 0:
+            raise ValueError('Clip durations should be positive.')
+        if not 0 <= index <= self._size:
+            raise IndexError(f'Clip index {index} out of range.')
+
+        self._reserve(self._size + 1)
+        offsets = self._offsets
+        # shift the offsets after the inserted clip by one slot and its duration
+        offsets[index + 2:self._size + 2] = offsets[index + 1:self._size + 1] + duration
+        offsets[index + 1] = offsets[index] + duration
+        self._size += 1
+
+    def remove(self, index: int):
+        if not 0 <= index < self._size:
+            raise IndexError(f'Clip index {index} out of range.')
+
+        offsets = self._offsets
+        duration = offsets[index + 1] - offsets[index]
+        offsets[index + 1:self._size] = offsets[index + 2:self._size + 1] - duration
+        self._size -= 1
+
 class Animation(BaseModel):
     sequence: list[Motion]
     description: str
+    # optional timing of each motion in `sequence`, required for timeline
+    # queries
+    timings: list[MotionTiming] | None = None
+
+    _timeline: TimelineIndex | None = PrivateAttr(default=None)
+
+    @root_validator
+    def check_timings(cls, values):
+        timings = values.get('timings')
+        sequence = values.get('sequence')
+        if timings is not None and sequence is not None and len(timings) != len(sequence):
+            raise ValueError(f'Animation has {len(sequence)} motions but {len(timings)} timings.')
+        return values
+
+    # The index is built on first use and kept up to date by `append_motion`,
+    # `insert_motion` and `remove_motion`. Modifying `sequence` or `timings`
+    # directly requires a call to `rebuild_timeline`.
+    def timeline(self) -> TimelineIndex:
+        if self._timeline is None:
+            if self.timings is None:
+                raise ValueError('Animation has no timings, a timeline cannot be built.')
+            self._timeline = TimelineIndex([t.duration for t in self.timings])
+        return self._timeline
+
+    def rebuild_timeline(self) -> TimelineIndex:
+        self._timeline = None
+        return self.timeline()
+
+    def motion_at(self, frame: int) -> Motion | None:
+        index = self.timeline().motion_at(frame)
+        return self.sequence[index] if index is not None else None
+
+    def motions_between(self, frame_start: int, frame_end: int) -> list[Motion]:
+        return [self.sequence[i] for i in self.timeline().overlapping(frame_start, frame_end)]
+
+    def append_motion(self, motion: Motion, timing: MotionTiming):
+        self.insert_motion(len(self.sequence), motion, timing)
+
+    def insert_motion(self, index: int, motion: Motion, timing: MotionTiming):
+        timeline = self.timeline()
+        timeline.insert(index, timing.duration)
+        self.sequence.insert(index, motion)
+        self.timings.insert(index, timing)
+
+    def remove_motion(self, index: int) -> Motion:
+        timeline = self.timeline()
+        timeline.remove(index)
+        self.timings.pop(index)
+        return self.sequence.pop(index)
 
 class MockMotion(BaseModel):
     description: str
@@ -0,0 +1,143 @@
+from functools import cache
+from typing import Any, TypeVar
+
+from pydantic.v1 import BaseModel, PrivateAttr
+
+# Immutable, hashable variants of the models in this package, for use as cache
+# keys (e.g. with `functools.lru_cache`) or in sets.
+#
+#   frozen_motion = freeze(motion)
+#   frozen_motion in seen
+#
+# `freeze` does not copy or re-validate the field values: the frozen variant
+# gets its own copy of the field dict and of the containers (lists, dicts, sets)
+# in it, sharing the values themselves. The original model is left untouched,
+# and later changes to it or to its containers do not reach the frozen variant.
+# Nested models are frozen recursively, also without touching the originals.
+# Containers of a frozen model are still plain lists and dicts and must not be
+# modified. The structural hash is computed on first use and cached on the
+# instance.
+
+Model = TypeVar('Model', bound=BaseModel)
+
+def structural_hash(value: Any) -> int:
+    # Models hash like the dicts they compare equal to (see `BaseModel.__eq__`),
+    # so the hash is independent of the model class and of the field order.
+    if isinstance(value, FrozenModel):
+        return hash(value)
+    if isinstance(value, BaseModel):
+        return _fields_hash(value)
+    if isinstance(value, dict):
+        return hash(frozenset((k, structural_hash(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return hash((type(value) is list, tuple(structural_hash(v) for v in value)))
+    if isinstance(value, (set, frozenset)):
+        return hash(frozenset(structural_hash(v) for v in value))
+    return hash(value)
+
+def _fields_hash(model: BaseModel) -> int:
+    return hash(frozenset((k, structural_hash(v)) for k, v in model.__dict__.items()))
+
+class FrozenModel:
+    # Marker base of every frozen variant, see `frozen_variant`.
+    __slots__ = ()
+
+def _frozen_hash(self) -> int:
+    if self._structural_hash is None:
+        object.__setattr__(self, '_structural_hash', _fields_hash(self))
+    return self._structural_hash
+
+def _frozen_eq(self, other: Any) -> bool:
+    if self is other:
+        return True
+    if isinstance(other, FrozenModel):
+        # different hashes rule out equality, equal hashes only need a
+        # comparison of the field values, not of their `.dict()`
+        if type(self)._thawed_cls is not type(other)._thawed_cls or hash(self) != hash(other):
+            return False
+        return self.__dict__ == other.__dict__
+    return BaseModel.__eq__(self, other)
+
+@cache
+def frozen_variant(model_cls: type[Model]) -> type[Model]:
+    # Subclass of `model_cls` that cannot be mutated and is hashable. Created
+    # once per model class.
+    if issubclass(model_cls, FrozenModel):
+        return model_cls
+
+    namespace = {
+        '__module__': __name__,
+        '__qualname__': f'Frozen{model_cls.__name__}',
+        '__annotations__': {'_structural_hash': int | None},
+        '_structural_hash': PrivateAttr(default=None),
+        'Config': type('Config', (), {'allow_mutation': False}),
+        '__hash__': _frozen_hash,
+        '__eq__': _frozen_eq,
+        'thaw': thaw,
+    }
+    frozen_cls = type(model_cls)(f'Frozen{model_cls.__name__}', (FrozenModel, model_cls), namespace)
+    frozen_cls._thawed_cls = model_cls
+    return frozen_cls
+
+def _copy_containers(value: Any) -> Any:
+    # copy of the container structure of `value`, sharing all other values
+    if isinstance(value, list):
+        return [_copy_containers(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_copy_containers(v) for v in value)
+    if isinstance(value, dict):
+        return {k: _copy_containers(v) for k, v in value.items()}
+    if isinstance(value, set):
+        return {_copy_containers(v) for v in value}
+    return value
+
+def _freeze_value(value: Any) -> Any:
+    # freezes nested models, updating containers in place. Only called on
+    # containers copied by `_copy_containers`.
+    if isinstance(value, BaseModel):
+        return freeze(value)
+    if isinstance(value, list):
+        value[:] = [_freeze_value(v) for v in value]
+    elif isinstance(value, tuple):
+        return tuple(_freeze_value(v) for v in value)
+    elif isinstance(value, dict):
+        for k, v in value.items():
+            value[k] = _freeze_value(v)
+    return value
+
+def freeze(model: Model) -> Model:
+    if isinstance(model, FrozenModel):
+        return model
+
+    fields = _copy_containers(model.__dict__)
+    for name, value in fields.items():
+        fields[name] = _freeze_value(value)
+
+    frozen_cls = frozen_variant(type(model))
+    frozen = frozen_cls.__new__(frozen_cls)
+    object.__setattr__(frozen, '__dict__', fields)
+    object.__setattr__(frozen, '__fields_set__', set(model.__fields_set__))
+    frozen._init_private_attributes()
+    return frozen
+
+def _thaw_value(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return thaw(value)
+    if isinstance(value, list):
+        return [_thaw_value(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_thaw_value(v) for v in value)
+    if isinstance(value, dict):
+        return {k: _thaw_value(v) for k, v in value.items()}
+    if isinstance(value, set):
+        return {_thaw_value(v) for v in value}
+    return value
+
+def thaw(model: Model) -> Model:
+    # Mutable copy of a frozen model (and its nested models), in its original
+    # model class.
+    if not isinstance(model, FrozenModel):
+        return model
+    return type(model)._thawed_cls.construct(
+        _fields_set=set(model.__fields_set__),
+        **{name: _thaw_value(value) for name, value in model.__dict__.items()})
@@ -7,6 +7,7 @@ import json
 from enum import Enum
 
 from cairos_types.skeleton import CairosWorkSkelMapping
+from cairos_types.buffers import BufferRef
 
 HoudiniNodeErrors: TypeAlias = dict[str, Sequence[str]] | None
 
@@ -110,11 +111,39 @@ class SequencerDataWrapper(BaseHoudiniData):
 
         return self_as_dict
 
+# Tells the sequencer to take the first `len(segments)` motions of the sequence
+# from previously cooked bgeo segments (one per motion) instead of cooking them
+# again. `cache_id` identifies the segment cache they come from, see
+# `cairos_types.resequence.SegmentCache`.
+class SegmentReuse(BaseModel):
+    cache_id: str
+    segments: list[Path]
+
+    @validator('segments')
+    def check_segments_exist(cls, v: list[Path]):
+        for segment in v:
+            if not segment.is_file():
+                raise ValueError(f'Cached segment does not exist at {segment}')
+        return v
+
+    @property
+    def count(self) -> int:
+        return len(self.segments)
+
 class SequencerRequest(BaseModel):
     job_id: tuple[str, UUID]
     config: SequencerConfig
     context: Context
     data: SequencerDataWrapper
+    reuse: SegmentReuse | None = None
+
+    @root_validator
+    def check_reuse(cls, values):
+        reuse = values.get('reuse')
+        data = values.get('data')
+        if reuse is not None and data is not None and reuse.count > len(data.animations):
+            raise ValueError(f'Cannot reuse {reuse.count} segments for a sequence of {len(data.animations)} motions.')
+        return values
 
 class SequencerSuccess(BaseModel):
     job_id: tuple[str, UUID]
@@ -122,6 +151,8 @@ class SequencerSuccess(BaseModel):
     output_gltf: Path
     node_errors: HoudiniNodeErrors
     temp_scene: Path | None
+    # per-motion bgeo segments of the cooked sequence, if the scene writes them
+    output_segments: list[Path] | None = None
 
     @root_validator
     def check_paths_exist(cls, values):
@@ -318,7 +349,8 @@ class AvatarUploadConfig(BaseHoudiniConfig):
     render_top_node: str = f"{prefix}/output"
 
 AvatarPreset: TypeAlias = Literal['mixamo']
-AvatarMapping: TypeAlias = AvatarPreset | Path | bytes # more to come in the near future
+# `BufferRef` points to mapping bytes sent out of band, see `cairos_types.buffers`
+AvatarMapping: TypeAlias = AvatarPreset | Path | bytes | BufferRef # more to come in the near future
 
 
 class AvatarUploadData(BaseModel):
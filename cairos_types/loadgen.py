@@ -0,0 +1,511 @@
+import argparse
+import datetime
+import queue
+import random
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+from uuid import UUID, uuid4
+
+import numpy as np
+from pydantic.v1 import BaseModel, root_validator
+
+from cairos_types.core import Motion
+from cairos_types.houdini import (
+    Context, HoudiniError,
+    SequencerConfig, SequencerOutput, SequencerDataWrapper, SequencerRequest, SequencerSuccess,
+    RetargetConfig, RetargetInput, RetargetOutput, RetargetDataWrapper, RetargetRequest, RetargetSuccess,
+    ExportConfig, ExportData, ExportDataWrapper, ExportRequest, ExportSuccess,
+    AvatarExportConfig, AvatarExportData, AvatarExportDataWrapper, AvatarExportRequest, AvatarExportSuccess,
+    AvatarUploadConfig, AvatarUploadData, AvatarUploadDataWrapper, AvatarUploadRequest, AvatarUploadSuccess,
+    AvatarAutorigConfig, AvatarAutorigData, AvatarAutorigDataWrapper, AvatarAutorigRequest, AvatarAutorigSuccess,
+    AvatarMappingConfig, AvatarMappingData, AvatarMappingDataWrapper, AvatarMappingRequest, AvatarMappingSuccess)
+from cairos_types.mapping import resolve_mapping
+
+# Load generator for capacity planning. It synthesizes valid `*Request`
+# messages for every job type (with temporary artifact files, so that the
+# validators pass), pushes them as JSON through an in-memory broker stand-in
+# to mock Houdini workers, which answer with `*Success` or `HoudiniError`
+# messages. The report contains throughput, latency percentiles and the cost of
+# every (de)serialization stage.
+#
+#   python -m cairos_types.loadgen --requests 1000 --concurrency 32 --workers 8
+
+JOB_TYPES = ('sequencer', 'retarget', 'export', 'avatar_export', 'avatar_upload', 'avatar_autorig', 'avatar_mapping')
+
+STAGES = ('build', 'serialize_request', 'deserialize_request', 'cook',
+          'serialize_response', 'deserialize_response', 'latency')
+
+class LoadGeneratorConfig(BaseModel):
+    requests: int = 100
+    # number of requests in flight at the same time
+    concurrency: int = 8
+    workers: int = 4
+    job_types: list[str] = list(JOB_TYPES)
+    motions_min: int = 2
+    motions_max: int = 20
+    avatar_size: int = 256 * 1024
+    # mean simulated cook time of the workers
+    cook_time: float = 0.0
+    error_rate: float = 0.05
+    seed: int | None = None
+    # seconds to wait for the response to a single request
+    response_timeout: float = 60.0
+
+    @root_validator
+    def check_config(cls, values):
+        if values.get('requests', 0) < 0:
+            raise ValueError('requests cannot be negative.')
+        if values.get('concurrency', 1) < 1:
+            raise ValueError('concurrency should be at least 1.')
+        if values.get('workers', 1) < 1:
+            raise ValueError('workers should be at least 1.')
+        if values.get('motions_min', 1) < 1:
+            raise ValueError('motions_min should be at least 1.')
+        if values.get('motions_min', 0) > values.get('motions_max', 0):
+            raise ValueError('motions_min cannot be larger than motions_max.')
+        if values.get('avatar_size', 0) < 0:
+            raise ValueError('avatar_size cannot be negative.')
+        if values.get('cook_time', 0) < 0:
+            raise ValueError('cook_time cannot be negative.')
+        if not 0 <= values.get('error_rate', 0) <= 1:
+            raise ValueError('error_rate should be between 0 and 1.')
+        if values.get('response_timeout', 1) <= 0:
+            raise ValueError('response_timeout should be positive.')
+        return values
+
+class _Artifacts:
+    # Temporary files referenced by the synthesized requests.
+    def __init__(self, directory: Path, config: LoadGeneratorConfig, rng: random.Random):
+        self.directory = directory
+        self.motions = []
+        for i in range(config.motions_max):
+            path = Path(directory, f'motion_{i}.bgeo')
+            path.write_bytes(rng.randbytes(1024))
+            self.motions.append(path)
+
+        self.avatar = Path(directory, 'avatar.fbx')
+        self.avatar.write_bytes(rng.randbytes(config.avatar_size))
+        self.avatar_bgeo = Path(directory, 'avatar.bgeo')
+        self.avatar_bgeo.write_bytes(rng.randbytes(config.avatar_size))
+        self.avatar_gltf = Path(directory, 'avatar.glb')
+        self.avatar_gltf.write_bytes(rng.randbytes(config.avatar_size))
+        self.sequencer_bgeo = Path(directory, 'sequence.bgeo.sc')
+        self.sequencer_bgeo.write_bytes(rng.randbytes(1024))
+        self.scene = Path(directory, 'scene.hip')
+        self.scene.touch()
+
+    def output(self, suffix: str) -> Path:
+        # outputs are only created by the mock workers
+        return Path(self.directory, f'{uuid4().hex}{suffix}')
+
+class RequestFactory:
+    def __init__(self, artifacts: _Artifacts, config: LoadGeneratorConfig, rng: random.Random):
+        self.artifacts = artifacts
+        self.config = config
+        self.rng = rng
+        self.mapping = resolve_mapping('mixamo').to_mapping()
+        self._builders: dict[str, Callable[[], BaseModel]] = {
+            'sequencer': self.sequencer,
+            'retarget': self.retarget,
+            'export': self.export,
+            'avatar_export': self.avatar_export,
+            'avatar_upload': self.avatar_upload,
+            'avatar_autorig': self.avatar_autorig,
+            'avatar_mapping': self.avatar_mapping,
+        }
+
+    def build(self, job_type: str) -> BaseModel:
+        return self._builders[job_type]()
+
+    def _context(self) -> Context:
+        return Context(username='loadgen', action='loadgen', thread=str(uuid4()))
+
+    def _job_id(self, job_type: str) -> tuple[str, UUID]:
+        return (job_type, uuid4())
+
+    def sequencer(self) -> SequencerRequest:
+        count = self.rng.randint(self.config.motions_min, self.config.motions_max)
+        now = datetime.datetime.now()
+        motions = [Motion(sg_id=self.rng.randint(1, 100000),
+                          description=f'Motion {i}',
+                          input=str(self.artifacts.motions[i % len(self.artifacts.motions)]),
+                          created_at=now,
+                          shot_description='Load generator shot',
+                          tags=['loadgen', f'take{i}'])
+                   for i in range(count)]
+        return SequencerRequest(
+            job_id=self._job_id('sequencer'),
+            config=SequencerConfig(scene_path=self.artifacts.scene),
+            context=self._context(),
+            data=SequencerDataWrapper(
+                animations=motions,
+                output=SequencerOutput(output_bgeo=self.artifacts.output('.bgeo.sc'),
+                                       output_gltf=self.artifacts.output('.glb'))))
+
+    def retarget(self) -> RetargetRequest:
+        return RetargetRequest(
+            job_id=self._job_id('retarget'),
+            config=RetargetConfig(scene_path=self.artifacts.scene),
+            context=self._context(),
+            data=RetargetDataWrapper(
+                input=RetargetInput(sequencer_bgeo=self.artifacts.sequencer_bgeo,
+                                    avatar_bgeo=self.artifacts.avatar_bgeo),
+                output=RetargetOutput(output_bgeo=self.artifacts.output('.bgeo.sc'),
+                                      output_gltf=self.artifacts.output('.glb'))))
+
+    def export(self) -> ExportRequest:
+        return ExportRequest(
+            job_id=self._job_id('export'),
+            config=ExportConfig(scene_path=self.artifacts.scene),
+            context=self._context(),
+            data=ExportDataWrapper(
+                input_data=ExportData(sequencer_product=self.artifacts.sequencer_bgeo,
+                                      output_path=self.artifacts.output(''),
+                                      output_zip=self.artifacts.output('.zip')),
+                components=['glb', 'fbx']))
+
+    def avatar_export(self) -> AvatarExportRequest:
+        return AvatarExportRequest(
+            avatar_id=uuid4(),
+            config=AvatarExportConfig(scene_path=self.artifacts.scene),
+            context=self._context(),
+            data=AvatarExportDataWrapper(
+                input_data=AvatarExportData(avatar_path=self.artifacts.avatar_bgeo,
+                                            output_path=self.artifacts.output(''),
+                                            output_zip=self.artifacts.output('.zip')),
+                components=['glb']))
+
+    def avatar_upload(self) -> AvatarUploadRequest:
+        return AvatarUploadRequest(
+            config=AvatarUploadConfig(scene_path=self.artifacts.scene),
+            context=self._context(),
+            data=AvatarUploadDataWrapper(
+                ingest=AvatarUploadData(avatar_id=uuid4(),
+                                        input_avatar=self.artifacts.avatar,
+                                        output_bgeo=self.artifacts.output('.bgeo'),
+                                        output_gltf=self.artifacts.output('.glb'),
+                                        output_thumbnail=self.artifacts.output('.png'),
+                                        output_skelref=self.artifacts.output('.png'),
+                                        output_joint_paths=self.artifacts.output('.csv'))))
+
+    def avatar_autorig(self) -> AvatarAutorigRequest:
+        avatar_id = uuid4()
+        return AvatarAutorigRequest(
+            avatar_id=avatar_id,
+            config=AvatarAutorigConfig(scene_path=self.artifacts.scene),
+            context=self._context(),
+            data=AvatarAutorigDataWrapper(
+                ingest=AvatarAutorigData(avatar_id=avatar_id,
+                                         input_avatar=self.artifacts.avatar,
+                                         output_bgeo=self.artifacts.output('.bgeo'),
+                                         output_gltf=self.artifacts.output('.glb'))))
+
+    def avatar_mapping(self) -> AvatarMappingRequest:
+        avatar_id = uuid4()
+        return AvatarMappingRequest(
+            avatar_id=avatar_id,
+            config=AvatarMappingConfig(scene_path=self.artifacts.scene),
+            context=self._context(),
+            data=AvatarMappingDataWrapper(
+                avatar=AvatarMappingData(avatar_id=avatar_id,
+                                         bgeo_to_overwrite=self.artifacts.avatar_bgeo,
+                                         gltf_to_overwrite=self.artifacts.avatar_gltf),
+                mapping=self.mapping))
+
+REQUEST_TYPES: dict[str, type[BaseModel]] = {
+    'sequencer': SequencerRequest,
+    'retarget': RetargetRequest,
+    'export': ExportRequest,
+    'avatar_export': AvatarExportRequest,
+    'avatar_upload': AvatarUploadRequest,
+    'avatar_autorig': AvatarAutorigRequest,
+    'avatar_mapping': AvatarMappingRequest,
+}
+
+SUCCESS_TYPES: dict[str, type[BaseModel]] = {
+    'sequencer': SequencerSuccess,
+    'retarget': RetargetSuccess,
+    'export': ExportSuccess,
+    'avatar_export': AvatarExportSuccess,
+    'avatar_upload': AvatarUploadSuccess,
+    'avatar_autorig': AvatarAutorigSuccess,
+    'avatar_mapping': AvatarMappingSuccess,
+}
+
+def _touch(*paths: Path):
+    for path in paths:
+        path.touch()
+
+def mock_success(job_type: str, request) -> BaseModel:
+    # Creates the outputs a Houdini job would write and the matching success
+    # message.
+    match job_type:
+        case 'sequencer':
+            output = request.data.output
+            _touch(output.output_bgeo, output.output_gltf)
+            return SequencerSuccess(job_id=request.job_id, output_bgeo=output.output_bgeo,
+                                    output_gltf=output.output_gltf, node_errors=None, temp_scene=None)
+        case 'retarget':
+            output = request.data.output
+            _touch(output.output_bgeo, output.output_gltf)
+            return RetargetSuccess(job_id=request.job_id, output_bgeo=output.output_bgeo,
+                                   output_gltf=output.output_gltf, node_errors=None, temp_scene=None)
+        case 'export' | 'avatar_export':
+            data = request.data.input_data
+            data.output_path.mkdir(exist_ok=True)
+            _touch(data.output_zip)
+            if job_type == 'export':
+                return ExportSuccess(job_id=request.job_id, output_path=data.output_path,
+                                     output_zip=data.output_zip, node_errors=None, temp_scene=None)
+            return AvatarExportSuccess(avatar_id=request.avatar_id, output_path=data.output_path,
+                                       output_zip=data.output_zip, node_errors=None, temp_scene=None)
+        case 'avatar_upload':
+            ingest = request.data.ingest
+            _touch(ingest.output_bgeo, ingest.output_gltf)
+            return AvatarUploadSuccess(avatar_id=ingest.avatar_id, output_bgeo=ingest.output_bgeo,
+                                       output_gltf=ingest.output_gltf, output_thumbnail=ingest.output_thumbnail,
+                                       output_skelref=ingest.output_skelref,
+                                       output_joint_paths=ingest.output_joint_paths,
+                                       node_errors=None, temp_scene=None)
+        case 'avatar_autorig':
+            ingest = request.data.ingest
+            _touch(ingest.output_bgeo, ingest.output_gltf)
+            return AvatarAutorigSuccess(avatar_id=request.avatar_id, output_bgeo=ingest.output_bgeo,
+                                        output_gltf=ingest.output_gltf, node_errors=None, temp_scene=None)
+        case 'avatar_mapping':
+            avatar = request.data.avatar
+            return AvatarMappingSuccess(avatar_id=request.avatar_id, output_bgeo=avatar.bgeo_to_overwrite,
+                                        output_gltf=avatar.gltf_to_overwrite, node_errors=None, temp_scene=None)
+
+    raise ValueError(f'Unknown job type {job_type}')
+
+@dataclass
+class _Message:
+    correlation_id: int
+    job_type: str
+    body: bytes
+    # response messages only
+    is_error: bool = False
+
+class InMemoryBroker:
+    # Stand-in for the message queue: one shared request queue consumed by the
+    # workers, responses are delivered to the future of their correlation id.
+    def __init__(self):
+        self.requests: queue.Queue[_Message | None] = queue.Queue()
+        self._pending: dict[int, Future] = {}
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    def publish(self, job_type: str, body: bytes) -> Future:
+        future = Future()
+        with self._lock:
+            correlation_id = self._next_id
+            self._next_id += 1
+            self._pending[correlation_id] = future
+        self.requests.put(_Message(correlation_id, job_type, body))
+        return future
+
+    def respond(self, message: _Message):
+        with self._lock:
+            future = self._pending.pop(message.correlation_id)
+        future.set_result(message)
+
+    def close(self, workers: int):
+        for _ in range(workers):
+            self.requests.put(None)
+
+class _Timings:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: dict[str, list[float]] = defaultdict(list)
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            self.samples[stage].append(seconds)
+
+class MockHoudiniWorker(threading.Thread):
+    def __init__(self, broker: InMemoryBroker, timings: _Timings, config: LoadGeneratorConfig, seed: int | None):
+        super().__init__(daemon=True)
+        self.broker = broker
+        self.timings = timings
+        self.config = config
+        self.rng = random.Random(seed)
+
+    def run(self):
+        while (message := self.broker.requests.get()) is not None:
+            try:
+                self._handle(message)
+            except Exception as e:
+                # a real worker reports failures as `HoudiniError` as well, the
+                # client must never be left waiting for a response
+                response = HoudiniError(error_message=f'Mock worker failed: {e!r}',
+                                        node_errors=None,
+                                        temp_scene=None)
+                self.broker.respond(_Message(message.correlation_id, message.job_type,
+                                             response.json().encode(), is_error=True))
+
+    def _handle(self, message: _Message):
+        start = time.perf_counter()
+        request = REQUEST_TYPES[message.job_type].parse_raw(message.body)
+        self.timings.record('deserialize_request', time.perf_counter() - start)
+
+        start = time.perf_counter()
+        if self.config.cook_time > 0:
+            time.sleep(self.rng.expovariate(1 / self.config.cook_time))
+        if self.rng.random() < self.config.error_rate:
+            response = HoudiniError(error_message='Mock cook failed',
+                                    node_errors={'/obj/loadgen/mock': ['Mock cook failed']},
+                                    temp_scene=None)
+        else:
+            response = mock_success(message.job_type, request)
+        self.timings.record('cook', time.perf_counter() - start)
+
+        start = time.perf_counter()
+        body = response.json().encode()
+        self.timings.record('serialize_response', time.perf_counter() - start)
+
+        self.broker.respond(_Message(message.correlation_id, message.job_type, body,
+                                     is_error=isinstance(response, HoudiniError)))
+
+@dataclass
+class StageStats:
+    count: int
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+    @classmethod
+    def from_samples(cls, samples: list[float]) -> 'StageStats':
+        values = np.asarray(samples, dtype=np.float64)
+        if values.size == 0:
+            return cls(0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        p50, p90, p99 = np.percentile(values, [50, 90, 99])
+        return cls(int(values.size), float(values.mean()), float(p50), float(p90), float(p99), float(values.max()))
+
+@dataclass
+class LoadReport:
+    requests: int
+    errors: int
+    elapsed: float
+    stages: dict[str, StageStats]
+    per_job_type: dict[str, int] = field(default_factory=dict)
+    request_bytes: int = 0
+    response_bytes: int = 0
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed if self.elapsed > 0 else 0.0
+
+    def format(self) -> str:
+        lines = [
+            f'requests: {self.requests} ({self.errors} errors) in {self.elapsed:.3f}s, '
+            f'{self.throughput:.1f} req/s',
+            f'bytes: {self.request_bytes} request, {self.response_bytes} response',
+            'jobs: ' + ', '.join(f'{k}={v}' for k, v in sorted(self.per_job_type.items())),
+            f'{"stage":<22}{"count":>8}{"mean ms":>10}{"p50 ms":>10}{"p90 ms":>10}{"p99 ms":>10}{"max ms":>10}',
+        ]
+        for stage, stats in self.stages.items():
+            lines.append(f'{stage:<22}{stats.count:>8}{stats.mean * 1e3:>10.3f}{stats.p50 * 1e3:>10.3f}'
+                         f'{stats.p90 * 1e3:>10.3f}{stats.p99 * 1e3:>10.3f}{stats.max * 1e3:>10.3f}')
+        return '\n'.join(lines)
+
+def run_load(config: LoadGeneratorConfig) -> LoadReport:
+    unknown = set(config.job_types) - set(JOB_TYPES)
+    if unknown:
+        raise ValueError(f'Unknown job types {sorted(unknown)}, expected some of {list(JOB_TYPES)}.')
+
+    rng = random.Random(config.seed)
+    timings = _Timings()
+    broker = InMemoryBroker()
+    counts: dict[str, int] = defaultdict(int)
+    sizes = {'request': 0, 'response': 0, 'errors': 0}
+    sizes_lock = threading.Lock()
+
+    with tempfile.TemporaryDirectory(prefix='cairos_loadgen_') as directory:
+        artifacts = _Artifacts(Path(directory), config, rng)
+        factory = RequestFactory(artifacts, config, rng)
+        factory_lock = threading.Lock()
+
+        workers = [MockHoudiniWorker(broker, timings, config, rng.randrange(2**32))
+                   for _ in range(config.workers)]
+        for worker in workers:
+            worker.start()
+
+        job_types = [rng.choice(config.job_types) for _ in range(config.requests)]
+
+        def send(job_type: str):
+            with factory_lock:
+                start = time.perf_counter()
+                request = factory.build(job_type)
+                timings.record('build', time.perf_counter() - start)
+
+            sent = time.perf_counter()
+            body = request.json().encode()
+            timings.record('serialize_request', time.perf_counter() - sent)
+
+            response = broker.publish(job_type, body).result(timeout=config.response_timeout)
+
+            start = time.perf_counter()
+            response_type = HoudiniError if response.is_error else SUCCESS_TYPES[job_type]
+            response_type.parse_raw(response.body)
+            done = time.perf_counter()
+            timings.record('deserialize_response', done - start)
+            timings.record('latency', done - sent)
+
+            with sizes_lock:
+                counts[job_type] += 1
+                sizes['request'] += len(body)
+                sizes['response'] += len(response.body)
+                sizes['errors'] += response.is_error
+
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=config.concurrency) as executor:
+                for result in [executor.submit(send, job_type) for job_type in job_types]:
+                    result.result()
+        finally:
+            broker.close(len(workers))
+            for worker in workers:
+                worker.join()
+        elapsed = time.perf_counter() - start
+
+    return LoadReport(
+        requests=config.requests,
+        errors=sizes['errors'],
+        elapsed=elapsed,
+        stages={stage: StageStats.from_samples(timings.samples[stage]) for stage in STAGES},
+        per_job_type=dict(counts),
+        request_bytes=sizes['request'],
+        response_bytes=sizes['response'])
+
+def main(argv: list[str] | None = None):
+    defaults = LoadGeneratorConfig()
+    parser = argparse.ArgumentParser(description='Generate load against mock Houdini workers.')
+    parser.add_argument('--requests', type=int, default=defaults.requests)
+    parser.add_argument('--concurrency', type=int, default=defaults.concurrency)
+    parser.add_argument('--workers', type=int, default=defaults.workers)
+    parser.add_argument('--job-types', nargs='+', choices=JOB_TYPES, default=defaults.job_types)
+    parser.add_argument('--motions-min', type=int, default=defaults.motions_min)
+    parser.add_argument('--motions-max', type=int, default=defaults.motions_max)
+    parser.add_argument('--avatar-size', type=int, default=defaults.avatar_size)
+    parser.add_argument('--cook-time', type=float, default=defaults.cook_time,
+                        help='mean simulated cook time in seconds')
+    parser.add_argument('--error-rate', type=float, default=defaults.error_rate)
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    parser.add_argument('--response-timeout', type=float, default=defaults.response_timeout,
+                        help='seconds to wait for a single response')
+    args = parser.parse_args(argv)
+
+    report = run_load(LoadGeneratorConfig(**vars(args)))
+    print(report.format())
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import NamedTuple
+
+from cairos_types.buffers import BufferRef, BufferSource
+from cairos_types.houdini import AvatarMapping
+from cairos_types.skeleton import CairosWorkSkelMapping, CairosWorkSkelIndexMapping
+
+# Resolution of `AvatarMapping` values (a preset name, a path to a mapping file,
+# the raw contents of a mapping file or a reference to contents sent out of
+# band) to a compiled, immutable
+# `CairosWorkSkelIndexMapping`. Mapping files contain a JSON serialized
+# `CairosWorkSkelMapping`. Presets are compiled once per process, mapping files
+# are compiled once per distinct content and kept in a bounded LRU cache, so
+# repeated jobs for the same rig skip parsing and validating the mapping.
+
+_MIXAMO_FINGERS = {'Pinky': 'Pinky', 'Ring': 'Ring', 'Mid': 'Middle', 'Index': 'Index', 'Thumb': 'Thumb'}
+
+def _mixamo_preset() -> dict[str, str]:
+    preset = {name: f'mixamorig:{name}' for name in CairosWorkSkelMapping.__fields__}
+    for side in ('Left', 'Right'):
+        preset[f'{side}HandPalm'] = f'mixamorig:{side}Hand'
+        for work, mixamo in _MIXAMO_FINGERS.items():
+            for i in (1, 2, 3):
+                preset[f'{side}Hand{work}{i}'] = f'mixamorig:{side}Hand{mixamo}{i}'
+
+    # the mixamo skeleton has no reference joint and only three spine joints
+    preset['Reference'] = ''
+    preset['Spine3'] = ''
+    return preset
+
+PRESETS: dict[str, dict[str, str]] = {
+    'mixamo': _mixamo_preset(),
+}
+
+class MappingCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+class MappingResolver:
+    def __init__(self, maxsize: int = 128):
+        if maxsize < 1:
+            raise ValueError('maxsize should be at least 1.')
+
+        self.maxsize = maxsize
+        self._presets: dict[str, CairosWorkSkelIndexMapping] = {}
+        self._compiled: OrderedDict[bytes, CairosWorkSkelIndexMapping] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def resolve(self, mapping: AvatarMapping, buffers: BufferSource | None = None) -> CairosWorkSkelIndexMapping:
+        # `buffers` is required for mappings given as a `BufferRef`
+        if isinstance(mapping, BufferRef):
+            if buffers is None:
+                raise ValueError('Resolving a mapping passed out of band requires a buffer source.')
+            # hashing works on the view, the contents are only copied when
+            # they have to be parsed
+            return self._resolve_content(buffers.resolve(mapping))
+        if isinstance(mapping, str):
+            return self._resolve_preset(mapping)
+        if isinstance(mapping, Path):
+            if not mapping.is_file():
+                raise ValueError(f'Mapping file does not exist at {mapping}')
+            return self._resolve_content(mapping.read_bytes())
+        if isinstance(mapping, (bytes, bytearray, memoryview)):
+            return self._resolve_content(mapping)
+
+        raise TypeError(f'Cannot resolve mapping of type {type(mapping).__name__}.')
+
+    def _resolve_preset(self, preset: str) -> CairosWorkSkelIndexMapping:
+        compiled = self._presets.get(preset)
+        if compiled is not None:
+            return compiled
+
+        if preset not in PRESETS:
+            raise ValueError(f'Unknown avatar preset {preset}, expected one of {list(PRESETS)}.')
+
+        compiled = CairosWorkSkelIndexMapping.from_mapping(CairosWorkSkelMapping(**PRESETS[preset]))
+        self._presets[preset] = compiled
+        return compiled
+
+    def _resolve_content(self, content: bytes | bytearray | memoryview) -> CairosWorkSkelIndexMapping:
+        digest = hashlib.sha256(content).digest()
+
+        with self._lock:
+            compiled = self._compiled.get(digest)
+            if compiled is not None:
+                self._compiled.move_to_end(digest)
+                self._hits += 1
+                return compiled
+            self._misses += 1
+
+        # parsing happens outside of the lock, concurrent misses for the same
+        # content compile to equal objects and the last one wins
+        compiled = CairosWorkSkelIndexMapping.from_mapping(CairosWorkSkelMapping.parse_raw(bytes(content)))
+
+        with self._lock:
+            self._compiled[digest] = compiled
+            self._compiled.move_to_end(digest)
+            while len(self._compiled) > self.maxsize:
+                self._compiled.popitem(last=False)
+
+        return compiled
+
+    def cache_info(self) -> MappingCacheInfo:
+        with self._lock:
+            return MappingCacheInfo(self._hits, self._misses, self.maxsize, len(self._compiled))
+
+    def cache_clear(self):
+        with self._lock:
+            self._compiled.clear()
+            self._hits = 0
+            self._misses = 0
+
+_default_resolver = MappingResolver()
+
+def resolve_mapping(mapping: AvatarMapping, buffers: BufferSource | None = None) -> CairosWorkSkelIndexMapping:
+    return _default_resolver.resolve(mapping, buffers)
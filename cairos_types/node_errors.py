@@ -0,0 +1,129 @@
+from array import array
+from typing import Hashable, Iterator
+
+import numpy as np
+
+from cairos_types.houdini import HoudiniNodeErrors
+
+# Compact storage for the `HoudiniNodeErrors` of many jobs. Node paths and error
+# messages are interned once, the errors of every job are stored as id arrays:
+#
+#   jobs     -> range of entries (`_job_entries`)
+#   entries  -> node id (`_entry_nodes`) and range of messages (`_entry_messages`)
+#   messages -> message id (`_message_ids`)
+#
+# Jobs are only ever appended, so "the last N jobs" is a suffix of these arrays.
+
+class _InternTable:
+    def __init__(self):
+        self.values: list[str] = []
+        self.ids: dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        id = self.ids.get(value)
+        if id is None:
+            id = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return id
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+class HoudiniErrorStore:
+    def __init__(self):
+        self._nodes = _InternTable()
+        self._messages = _InternTable()
+
+        self._jobs: dict[Hashable, int] = {}
+        self._job_ids: list[Hashable] = []
+        # `node_errors` of a job may be None, which is kept apart from {}
+        self._job_is_none = bytearray()
+        self._job_entries = array('I', [0])
+        self._entry_nodes = array('I')
+        self._entry_messages = array('I', [0])
+        self._message_ids = array('I')
+
+    def __len__(self) -> int:
+        return len(self._job_ids)
+
+    def __contains__(self, job_id: Hashable) -> bool:
+        return job_id in self._jobs
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._job_ids)
+
+    @property
+    def node_count(self) -> int:
+        return len(self._nodes)
+
+    @property
+    def message_count(self) -> int:
+        return len(self._messages)
+
+    def add(self, job_id: Hashable, node_errors: HoudiniNodeErrors):
+        if job_id in self._jobs:
+            raise ValueError(f'Errors of job {job_id} are already stored.')
+
+        self._jobs[job_id] = len(self._job_ids)
+        self._job_ids.append(job_id)
+        self._job_is_none.append(node_errors is None)
+
+        for node, messages in (node_errors or {}).items():
+            self._entry_nodes.append(self._nodes.intern(node))
+            self._message_ids.extend(self._messages.intern(m) for m in messages)
+            self._entry_messages.append(len(self._message_ids))
+
+        self._job_entries.append(len(self._entry_nodes))
+
+    def get(self, job_id: Hashable) -> HoudiniNodeErrors:
+        job = self._jobs[job_id]
+        if self._job_is_none[job]:
+            return None
+
+        nodes = self._nodes.values
+        messages = self._messages.values
+        errors = {}
+        for entry in range(self._job_entries[job], self._job_entries[job + 1]):
+            start, end = self._entry_messages[entry], self._entry_messages[entry + 1]
+            errors[nodes[self._entry_nodes[entry]]] = [messages[m] for m in self._message_ids[start:end]]
+        return errors
+
+    def _node_mask(self, prefix: str) -> np.ndarray:
+        # nodes at or below the node path `prefix`
+        if prefix in ('', '/'):
+            return np.ones(len(self._nodes), dtype=bool)
+        prefix = prefix.rstrip('/')
+        return np.fromiter((n == prefix or n.startswith(prefix + '/') for n in self._nodes.values),
+                           dtype=bool, count=len(self._nodes))
+
+    def _recent_entries(self, last_n: int | None) -> slice:
+        jobs = len(self._job_ids)
+        first_job = 0 if last_n is None else max(jobs - last_n, 0)
+        return slice(self._job_entries[first_job], self._job_entries[jobs])
+
+    def top_failing_nodes(self, prefix: str = '', last_n: int | None = None, k: int = 10) -> list[tuple[str, int]]:
+        # Nodes at or below `prefix` (e.g. `/obj/sequencer`) that reported
+        # errors in the most jobs, among the last `last_n` jobs (all jobs by
+        # default). Returns (node path, number of jobs) pairs.
+        entries = self._recent_entries(last_n)
+        node_ids = np.frombuffer(self._entry_nodes, dtype=np.uint32)[entries]
+        counts = np.bincount(node_ids, minlength=len(self._nodes))
+        counts[~self._node_mask(prefix)] = 0
+
+        top = np.argsort(-counts, kind='stable')[:k]
+        return [(self._nodes.values[i], int(counts[i])) for i in top if counts[i] > 0]
+
+    def top_messages(self, prefix: str = '', last_n: int | None = None, k: int = 10) -> list[tuple[str, int]]:
+        # Most frequent error messages of nodes at or below `prefix`, among the
+        # last `last_n` jobs.
+        entries = self._recent_entries(last_n)
+        node_ids = np.frombuffer(self._entry_nodes, dtype=np.uint32)[entries]
+        bounds = np.frombuffer(self._entry_messages, dtype=np.uint32)[entries.start:entries.stop + 1]
+        message_ids = np.frombuffer(self._message_ids, dtype=np.uint32)[bounds[0]:bounds[-1]]
+
+        # per message, whether the node of its entry is selected
+        selected = np.repeat(self._node_mask(prefix)[node_ids], np.diff(bounds))
+        counts = np.bincount(message_ids[selected], minlength=len(self._messages))
+
+        top = np.argsort(-counts, kind='stable')[:k]
+        return [(self._messages.values[i], int(counts[i])) for i in top if counts[i] > 0]
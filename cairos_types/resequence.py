@@ -0,0 +1,116 @@
+import hashlib
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Sequence
+
+from cairos_types.core import Motion
+from cairos_types.houdini import SegmentReuse
+
+# Incremental re-sequencing. When a user edits a sequence, usually only a few
+# motions change. `diff_animations` finds which parts of two
+# `SequencerDataWrapper.animations` lists are unchanged, and `SegmentCache`
+# remembers the bgeo segment that was cooked for every motion at every position,
+# so a new `SequencerRequest` can reuse the unchanged prefix of the sequence.
+
+def motion_key(motion: Motion) -> str:
+    return hashlib.sha256(motion.json(sort_keys=True).encode()).hexdigest()
+
+@dataclass(frozen=True)
+class SequenceDiff:
+    # number of leading motions that are identical in both sequences
+    prefix_length: int
+    # unchanged runs as (old start, new start, length), in order
+    matching_segments: tuple[tuple[int, int, int], ...]
+    # indices into the new sequence of motions that are not part of any
+    # unchanged run
+    changed: tuple[int, ...]
+    # indices into the old sequence of motions that are not part of any
+    # unchanged run
+    removed: tuple[int, ...]
+
+    @property
+    def unchanged(self) -> bool:
+        return len(self.changed) == 0 and len(self.removed) == 0
+
+def diff_animations(old: Sequence[Motion], new: Sequence[Motion]) -> SequenceDiff:
+    old_keys = [motion_key(m) for m in old]
+    new_keys = [motion_key(m) for m in new]
+
+    prefix_length = 0
+    for old_key, new_key in zip(old_keys, new_keys):
+        if old_key != new_key:
+            break
+        prefix_length += 1
+
+    matcher = SequenceMatcher(a=old_keys, b=new_keys, autojunk=False)
+    matching = tuple((b.a, b.b, b.size) for b in matcher.get_matching_blocks() if b.size > 0)
+
+    matched_old = set()
+    matched_new = set()
+    for old_start, new_start, size in matching:
+        matched_old.update(range(old_start, old_start + size))
+        matched_new.update(range(new_start, new_start + size))
+
+    changed = tuple(i for i in range(len(new_keys)) if i not in matched_new)
+    removed = tuple(i for i in range(len(old_keys)) if i not in matched_old)
+
+    return SequenceDiff(prefix_length=prefix_length,
+                        matching_segments=matching,
+                        changed=changed,
+                        removed=removed)
+
+def prefix_keys(animations: Sequence[Motion]) -> list[str]:
+    # Chained hash of every prefix of `animations`: the key at position k
+    # identifies motions 0..k, so two sequences share a key at position k only
+    # if they are identical up to and including k.
+    keys = []
+    previous = b''
+    for motion in animations:
+        previous = hashlib.sha256(previous + motion_key(motion).encode()).digest()
+        keys.append(previous.hex())
+    return keys
+
+@dataclass
+class SegmentCache:
+    # Cooked segments keyed by the prefix of the sequence they were cooked in
+    # (see `prefix_keys`). A segment depends on the motions before it (its
+    # start frame, blending with the previous motion), so the same motion after
+    # a different prefix is a different entry.
+    cache_id: str
+    segments: dict[str, Path] = field(default_factory=dict)
+
+    def store(self, animations: Sequence[Motion], segments: Sequence[Path]):
+        if len(animations) != len(segments):
+            raise ValueError(f'Expected {len(animations)} segments, got {len(segments)}.')
+
+        for key, segment in zip(prefix_keys(animations), segments):
+            self.segments[key] = segment
+
+    def lookup(self, key: str) -> Path | None:
+        segment = self.segments.get(key)
+        if segment is None or not segment.is_file():
+            return None
+        return segment
+
+    def reusable_prefix(self, animations: Sequence[Motion]) -> list[Path]:
+        prefix = []
+        for key in prefix_keys(animations):
+            segment = self.lookup(key)
+            if segment is None:
+                break
+            prefix.append(segment)
+        return prefix
+
+    def plan(self, animations: Sequence[Motion]) -> SegmentReuse | None:
+        # `SegmentReuse` for the longest cached prefix of `animations`, None if
+        # nothing can be reused
+        prefix = self.reusable_prefix(animations)
+        if not prefix:
+            return None
+        return SegmentReuse(cache_id=self.cache_id, segments=prefix)
+
+    def evict(self, keep: Sequence[Motion]):
+        # drop every entry that is not part of the sequence `keep`
+        wanted = set(prefix_keys(keep))
+        self.segments = {k: v for k, v in self.segments.items() if k in wanted}
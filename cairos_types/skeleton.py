@@ -1,3 +1,6 @@
+from enum import IntEnum
+from typing import ClassVar, Sequence
+import numpy as np
 from pydantic.v1 import BaseModel
 
 # This is a class that represents a mapping of a user skeleton to our work
@@ -59,3 +62,272 @@ class CairosWorkSkelMapping(BaseModel):
     RightForeArm: str
     Neck: str
     Head: str
+
+    # parent/child structure of the work skeleton, see `WORK_SKEL_HIERARCHY`
+    hierarchy: ClassVar['SkeletonHierarchy']
+
+# Fixed enumeration of the work skeleton joints. The index of every joint is its
+# position in `CairosWorkSkelMapping`, so the field declaration order above is
+# the canonical joint order and must not be changed.
+CairosWorkSkelJoint = IntEnum(
+    'CairosWorkSkelJoint',
+    [(name, index) for index, name in enumerate(CairosWorkSkelMapping.__fields__)])
+
+WORK_SKEL_JOINT_COUNT = len(CairosWorkSkelJoint)
+
+# Compact form of `CairosWorkSkelMapping`. Instead of one string per joint it
+# keeps the joint table of the user skeleton and an int array with one entry per
+# work skeleton joint (in `CairosWorkSkelJoint` order). Each entry is an index
+# into `user_joints`, or -1 when the work skeleton joint is not mapped. This
+# allows remapping per-frame joint arrays of the user skeleton with a single
+# gather, see `CairosWorkSkelIndexMapping.remap`.
+class CairosWorkSkelIndexMapping:
+    __slots__ = ('user_joints', 'indices')
+
+    user_joints: tuple[str, ...]
+    indices: np.ndarray
+
+    def __init__(self, user_joints: Sequence[str], indices: Sequence[int] | np.ndarray):
+        user_joints = tuple(user_joints)
+        indices = np.array(indices, dtype=np.int32)
+
+        if indices.shape != (WORK_SKEL_JOINT_COUNT,):
+            raise ValueError(f'Index mapping should have exactly {WORK_SKEL_JOINT_COUNT} entries, got {indices.shape}.')
+        if indices.size > 0 and (indices.min() < -1 or indices.max() >= len(user_joints)):
+            raise ValueError('Index mapping contains indices outside of the user joint table.')
+        if '' in user_joints:
+            raise ValueError('User joint table cannot contain empty joint names.')
+
+        indices.setflags(write=False)
+        object.__setattr__(self, 'user_joints', user_joints)
+        object.__setattr__(self, 'indices', indices)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable.')
+
+    @classmethod
+    def from_mapping(cls,
+                     mapping: CairosWorkSkelMapping,
+                     user_joints: Sequence[str] | None = None) -> 'CairosWorkSkelIndexMapping':
+        values = [getattr(mapping, joint.name) for joint in CairosWorkSkelJoint]
+
+        # without an explicit joint table the mapped joints are enough to
+        # reconstruct the mapping, in order of their first appearance
+        if user_joints is None:
+            user_joints = list(dict.fromkeys(v for v in values if v != ''))
+
+        lookup = {name: index for index, name in enumerate(user_joints)}
+        indices = []
+        for joint, value in zip(CairosWorkSkelJoint, values):
+            if value == '':
+                indices.append(-1)
+            elif value in lookup:
+                indices.append(lookup[value])
+            else:
+                raise ValueError(f'Joint {joint.name} is mapped to {value}, which is not in the user joint table.')
+
+        return cls(user_joints, indices)
+
+    def to_mapping(self) -> CairosWorkSkelMapping:
+        values = {
+            joint.name: self.user_joints[index] if index >= 0 else ''
+            for joint, index in zip(CairosWorkSkelJoint, self.indices.tolist())}
+        # every value is a string by construction, so validation can be skipped
+        return CairosWorkSkelMapping.construct(**values)
+
+    @property
+    def mapped(self) -> np.ndarray:
+        return self.indices >= 0
+
+    def remap(self, user_data: np.ndarray, axis: int = 1, fill_value=0) -> np.ndarray:
+        # Gathers per-joint data of the user skeleton (e.g. an array with shape
+        # (frames, user joints, 4, 4)) into the work skeleton joint order along
+        # `axis`. Unmapped work skeleton joints are set to `fill_value`.
+        user_data = np.asarray(user_data)
+        axis = axis % user_data.ndim
+
+        if user_data.shape[axis] != len(self.user_joints):
+            raise ValueError(f'Expected {len(self.user_joints)} user joints along axis {axis}, got {user_data.shape[axis]}.')
+
+        mapped = self.mapped
+        if not mapped.any():
+            shape = list(user_data.shape)
+            shape[axis] = WORK_SKEL_JOINT_COUNT
+            return np.full(shape, fill_value, dtype=user_data.dtype)
+
+        result = np.take(user_data, np.where(mapped, self.indices, 0), axis=axis)
+        if not mapped.all():
+            selector = [slice(None)] * result.ndim
+            selector[axis] = ~mapped
+            result[tuple(selector)] = fill_value
+
+        return result
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CairosWorkSkelIndexMapping):
+            return NotImplemented
+        return self.user_joints == other.user_joints and np.array_equal(self.indices, other.indices)
+
+    def __hash__(self) -> int:
+        return hash((self.user_joints, self.indices.tobytes()))
+
+    def __len__(self) -> int:
+        return WORK_SKEL_JOINT_COUNT
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(user_joints={len(self.user_joints)}, mapped={int(self.mapped.sum())})'
+
+# Parent of every work skeleton joint, `None` for the root. The parent/child
+# structure matches the work skeleton in the Houdini scenes.
+_WORK_SKEL_PARENTS: dict[str, str | None] = {
+    'Reference': None,
+    'Hips': 'Reference',
+    'Spine': 'Hips',
+    'Spine1': 'Spine',
+    'Spine2': 'Spine1',
+    'Spine3': 'Spine2',
+    'Neck': 'Spine3',
+    'Head': 'Neck',
+    **{f'{side}Shoulder': 'Spine3' for side in ('Left', 'Right')},
+    **{f'{side}Arm': f'{side}Shoulder' for side in ('Left', 'Right')},
+    **{f'{side}ForeArm': f'{side}Arm' for side in ('Left', 'Right')},
+    **{f'{side}HandPalm': f'{side}ForeArm' for side in ('Left', 'Right')},
+    **{f'{side}UpLeg': 'Hips' for side in ('Left', 'Right')},
+    **{f'{side}Leg': f'{side}UpLeg' for side in ('Left', 'Right')},
+    **{f'{side}Foot': f'{side}Leg' for side in ('Left', 'Right')},
+    **{f'{side}ToeBase': f'{side}Foot' for side in ('Left', 'Right')},
+    **{f'{side}Hand{finger}{i}': f'{side}Hand{finger}{i - 1}' if i > 1 else f'{side}HandPalm'
+       for side in ('Left', 'Right')
+       for finger in ('Thumb', 'Index', 'Mid', 'Ring', 'Pinky')
+       for i in (1, 2, 3)},
+}
+
+# Parent/child structure of a skeleton as arrays indexed by joint. Joints are
+# processed in `topological_order` (every parent before its children), grouped
+# into `levels` of equal depth so that batched operations can handle all joints
+# of a level at once.
+class SkeletonHierarchy:
+    __slots__ = ('joints', 'parents', 'depths', 'topological_order', 'levels', 'chains')
+
+    joints: tuple[str, ...]
+    parents: np.ndarray
+    depths: np.ndarray
+    topological_order: np.ndarray
+    levels: tuple[np.ndarray, ...]
+    chains: dict[str, tuple[int, ...]]
+
+    def __init__(self, joints: Sequence[str], parents: Sequence[int] | np.ndarray):
+        joints = tuple(joints)
+        parents = np.array(parents, dtype=np.int32)
+
+        if parents.shape != (len(joints),):
+            raise ValueError(f'Expected {len(joints)} parent indices, got {parents.shape}.')
+        if (parents < -1).any() or (parents >= len(joints)).any():
+            raise ValueError('Parent indices should be -1 or valid joint indices.')
+
+        depths = np.full(len(joints), -1, dtype=np.int32)
+        for start in range(len(joints)):
+            # walk up until a joint with a known depth (or the root) is found
+            path = []
+            joint = start
+            while joint != -1 and depths[joint] == -1:
+                if joint in path:
+                    raise ValueError(f'Skeleton hierarchy has a cycle at joint {joints[joint]}.')
+                path.append(joint)
+                joint = parents[joint]
+
+            depth = depths[joint] if joint != -1 else -1
+            for joint in reversed(path):
+                depth += 1
+                depths[joint] = depth
+
+        order = np.argsort(depths, kind='stable').astype(np.int32)
+        levels = tuple(order[depths[order] == d] for d in range(int(depths.max()) + 1)) if len(joints) else ()
+
+        for array in (parents, depths, order, *levels):
+            array.setflags(write=False)
+
+        self.joints = joints
+        self.parents = parents
+        self.depths = depths
+        self.topological_order = order
+        self.levels = levels
+        self.chains = self._find_chains()
+
+    @classmethod
+    def from_parent_names(cls, parents: dict[str, str | None]) -> 'SkeletonHierarchy':
+        joints = list(parents)
+        lookup = {name: index for index, name in enumerate(joints)}
+        return cls(joints, [lookup[p] if p is not None else -1 for p in parents.values()])
+
+    def _find_chains(self) -> dict[str, tuple[int, ...]]:
+        # A chain is a maximal run of joints where every joint except the last
+        # has exactly one child. Chains are named after their first joint.
+        children = [[] for _ in self.joints]
+        for joint, parent in enumerate(self.parents.tolist()):
+            if parent != -1:
+                children[parent].append(joint)
+
+        chains = {}
+        for joint in self.topological_order.tolist():
+            parent = self.parents[joint]
+            if parent != -1 and len(children[parent]) == 1:
+                # continues the chain of its parent
+                continue
+
+            chain = [joint]
+            while len(children[chain[-1]]) == 1:
+                chain.append(children[chain[-1]][0])
+            chains[self.joints[joint]] = tuple(chain)
+
+        return chains
+
+    @property
+    def segments(self) -> np.ndarray:
+        # (parent, child) index pairs for every bone, in topological order
+        children = self.topological_order[self.parents[self.topological_order] != -1]
+        return np.stack([self.parents[children], children], axis=1)
+
+    def forward_kinematics(self, local_transforms: np.ndarray) -> np.ndarray:
+        # Composes local joint transforms into world transforms. The input has
+        # shape (..., joints, 4, 4), where the leading axes are typically
+        # frames. Transforms act on column vectors, i.e. a child world transform
+        # is `parent_world @ child_local`.
+        local_transforms = np.asarray(local_transforms)
+        if local_transforms.shape[-3:] != (len(self.joints), 4, 4):
+            raise ValueError(f'Expected local transforms with shape (..., {len(self.joints)}, 4, 4), got {local_transforms.shape}.')
+
+        world = np.empty_like(local_transforms)
+        for level in self.levels:
+            parents = self.parents[level]
+            roots = parents == -1
+            if roots.any():
+                world[..., level[roots], :, :] = local_transforms[..., level[roots], :, :]
+            if not roots.all():
+                children = level[~roots]
+                world[..., children, :, :] = world[..., parents[~roots], :, :] @ local_transforms[..., children, :, :]
+
+        return world
+
+    def world_positions(self, local_transforms: np.ndarray) -> np.ndarray:
+        return self.forward_kinematics(local_transforms)[..., :3, 3]
+
+def compose_transforms(rotations: np.ndarray, translations: np.ndarray) -> np.ndarray:
+    # Builds (..., 4, 4) transforms from (..., 3, 3) rotations and (..., 3)
+    # translations.
+    rotations = np.asarray(rotations)
+    translations = np.asarray(translations)
+    transforms = np.zeros(rotations.shape[:-2] + (4, 4), dtype=np.result_type(rotations, translations))
+    transforms[..., :3, :3] = rotations
+    transforms[..., :3, 3] = translations
+    transforms[..., 3, 3] = 1
+    return transforms
+
+# The work skeleton hierarchy in `CairosWorkSkelJoint` order, so its joint
+# indices line up with `CairosWorkSkelIndexMapping`.
+WORK_SKEL_HIERARCHY = SkeletonHierarchy(
+    [joint.name for joint in CairosWorkSkelJoint],
+    [CairosWorkSkelJoint[_WORK_SKEL_PARENTS[joint.name]] if _WORK_SKEL_PARENTS[joint.name] is not None else -1
+     for joint in CairosWorkSkelJoint])
+
+CairosWorkSkelMapping.hierarchy = WORK_SKEL_HIERARCHY
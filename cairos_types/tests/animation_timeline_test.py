@@ -0,0 +1,67 @@
+import datetime
+from pathlib import Path
+import pytest
+
+from cairos_types.core import Animation, Motion, MotionTiming, TimelineIndex
+
+@pytest.fixture(scope='module')
+def existing_file() -> Path:
+    return Path(Path(__file__).parent.parent.parent , 'pyproject.toml')
+
+def make_motion(sg_id: int, existing_file: Path) -> Motion:
+    return Motion(
+        sg_id=sg_id,
+        description=f'Motion {sg_id}',
+        input=str(existing_file),
+        shot_description='Timeline test',
+        created_at=datetime.datetime.now())
+
+@pytest.fixture
+def animation(existing_file: Path) -> Animation:
+    return Animation(
+        sequence=[make_motion(i, existing_file) for i in range(3)],
+        description='Timeline test',
+        timings=[MotionTiming(frame_end=10),
+                 MotionTiming(frame_start=5, frame_end=25),
+                 MotionTiming(frame_end=5)])
+
+def test_timing_validation(existing_file: Path):
+    with pytest.raises(ValueError):
+        MotionTiming(frame_start=10, frame_end=10)
+
+    with pytest.raises(ValueError):
+        Animation(sequence=[make_motion(1, existing_file)],
+                  description='Mismatched timings',
+                  timings=[])
+
+def test_timeline_queries(animation: Animation):
+    timeline = animation.timeline()
+
+    assert timeline.offsets.tolist() == [0, 10, 30, 35]
+    assert timeline.motion_at(0) == 0
+    assert timeline.motion_at(10) == 1
+    assert timeline.motion_at(34) == 2
+    assert timeline.motion_at(35) is None
+    assert timeline.overlapping(9, 11) == range(0, 2)
+    assert timeline.overlapping(10, 30) == range(1, 2)
+    assert timeline.overlapping(40, 50) == range(0)
+    assert animation.motion_at(12).sg_id == 1
+
+def test_timeline_incremental_updates(animation: Animation, existing_file: Path):
+    animation.append_motion(make_motion(3, existing_file), MotionTiming(frame_end=15))
+    animation.insert_motion(0, make_motion(4, existing_file), MotionTiming(frame_end=2))
+    removed = animation.remove_motion(2)
+
+    assert removed.sg_id == 1
+    assert [m.sg_id for m in animation.sequence] == [4, 0, 2, 3]
+    assert animation.timeline().offsets.tolist() == \
+        TimelineIndex([t.duration for t in animation.timings]).offsets.tolist()
+    assert animation.timeline().offsets.tolist() == [0, 2, 12, 17, 32]
+
+def test_timeline_growth():
+    timeline = TimelineIndex()
+    for _ in range(1000):
+        timeline.append(3)
+
+    assert timeline.total_frames == 3000
+    assert timeline.motion_at(2999) == 999
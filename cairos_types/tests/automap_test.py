@@ -0,0 +1,60 @@
+import pytest
+
+from cairos_types.automap import SkeletonAutoMapper, normalize_joint_name
+from cairos_types.skeleton import CairosWorkSkelJoint
+
+@pytest.fixture(scope='module')
+def mapper() -> SkeletonAutoMapper:
+    return SkeletonAutoMapper()
+
+@pytest.fixture(scope='module')
+def unreal_joints() -> list[str]:
+    return ['root', 'pelvis', 'spine_01', 'spine_02', 'spine_03', 'neck_01',
+            'head', 'clavicle_l', 'upperarm_l', 'lowerarm_l', 'hand_l',
+            'clavicle_r', 'upperarm_r', 'lowerarm_r', 'hand_r', 'thigh_l',
+            'calf_l', 'foot_l', 'ball_l', 'thigh_r', 'calf_r', 'foot_r',
+            'ball_r']
+
+def test_normalize_joint_name():
+    features = normalize_joint_name('mixamorig:LeftHandIndex1')
+    assert (features.side, features.digit, features.core) == (-1, 1, 'handindex')
+
+    features = normalize_joint_name('upperarm_r')
+    assert (features.side, features.digit, features.core) == (1, -1, 'upperarm')
+
+def test_automap_mixamo(mapper: SkeletonAutoMapper):
+    joints = [f'mixamorig:{name}' for name in
+              ['Hips', 'Spine', 'LeftArm', 'RightArm', 'LeftHand', 'LeftHandMiddle1']]
+    result = mapper.map(joints)
+
+    assert result.mapping.Hips == 'mixamorig:Hips'
+    assert result.mapping.LeftArm == 'mixamorig:LeftArm'
+    assert result.mapping.RightArm == 'mixamorig:RightArm'
+    assert result.mapping.LeftHandPalm == 'mixamorig:LeftHand'
+    assert result.mapping.LeftHandMid1 == 'mixamorig:LeftHandMiddle1'
+    assert result.mapping.Head == ''
+    assert result.confidence[CairosWorkSkelJoint.Head] == 0
+
+def test_automap_batch(mapper: SkeletonAutoMapper, unreal_joints: list[str]):
+    results = mapper.map_batch([unreal_joints] * 3)
+
+    assert len(results) == 3
+    for result in results:
+        assert result.mapping.Hips == 'pelvis'
+        assert result.mapping.LeftUpLeg == 'thigh_l'
+        assert result.mapping.RightForeArm == 'lowerarm_r'
+        assert result.mapping.RightToeBase == 'ball_r'
+        assert result.confidence_by_joint()['LeftShoulder'] > 0.5
+
+def test_automap_vector_cache_is_shared_across_namespaces():
+    mapper = SkeletonAutoMapper(cache_size=64)
+    names = ['Hips', 'Spine', 'LeftArm', 'RightArm', 'LeftUpLeg', 'RightUpLeg']
+    results = mapper.map_batch([[f'rig{i}:{name}' for name in names] for i in range(20)])
+
+    # one vector per distinct core name, shared by every namespace
+    assert mapper.cache_info().vectors == 4
+    assert mapper.cache_info().names == 64
+    assert results[-1].mapping.LeftArm == 'rig19:LeftArm'
+
+    mapper.cache_clear()
+    assert mapper.cache_info() == (0, 0, 64)
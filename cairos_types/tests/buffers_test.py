@@ -0,0 +1,101 @@
+import subprocess
+import sys
+from multiprocessing import shared_memory
+from pathlib import Path
+import pytest
+
+from cairos_types.buffers import (BufferRef, FrameBuffers, SharedMemoryBuffers,
+                                  decode_frames, encode_frames, pack_frames, unpack_frames)
+from cairos_types.mapping import MappingResolver
+from cairos_types.skeleton import CairosWorkSkelMapping
+
+@pytest.fixture(scope='module')
+def mapping_content() -> bytes:
+    values = {name: f'rig_{name}' for name in CairosWorkSkelMapping.__fields__}
+    return CairosWorkSkelMapping(**values).json().encode()
+
+def test_buffer_ref_validation():
+    with pytest.raises(ValueError):
+        BufferRef(transport='frame', length=10)
+    with pytest.raises(ValueError):
+        BufferRef(transport='shm', length=10)
+
+def test_frames_round_trip(mapping_content: bytes):
+    buffers = FrameBuffers()
+    ref = buffers.add(mapping_content)
+    frames = encode_frames(ref, buffers)
+
+    assert frames[1].obj is mapping_content
+
+    envelope, received = decode_frames(unpack_frames(pack_frames(frames)))
+    payload = received.resolve(BufferRef.parse_raw(bytes(envelope)))
+
+    assert isinstance(payload, memoryview)
+    assert payload == mapping_content
+
+def test_unpack_frames_is_zero_copy():
+    body = bytearray(pack_frames([b'{}', b'payload']))
+    frames = unpack_frames(body)
+    body[-7:] = b'changed'
+
+    assert frames[1] == b'changed'
+
+    with pytest.raises(ValueError):
+        unpack_frames(body[:-1])
+
+def test_resolve_mapping_from_buffers(mapping_content: bytes):
+    resolver = MappingResolver()
+    expected = resolver.resolve(mapping_content)
+
+    buffers = FrameBuffers()
+    assert resolver.resolve(buffers.add(mapping_content), buffers) is expected
+
+    with SharedMemoryBuffers() as writer:
+        ref = writer.put(mapping_content)
+        assert resolver.resolve(ref, writer) is expected
+        assert resolver.cache_info().hits == 2
+
+    with pytest.raises(ValueError):
+        resolver.resolve(ref)
+
+def test_shared_memory_from_another_process(mapping_content: bytes):
+    reader = (
+        'import sys\n'
+        'from cairos_types.buffers import BufferRef, SharedMemoryBuffers\n'
+        'buffers = SharedMemoryBuffers()\n'
+        'view = buffers.resolve(BufferRef.parse_raw(sys.argv[1]))\n'
+        'sys.stdout.write(bytes(view).decode())\n'
+        'view.release()\n'
+        'buffers.close()\n')
+
+    with SharedMemoryBuffers() as writer:
+        ref = writer.put(mapping_content)
+        for _ in range(2):
+            result = subprocess.run([sys.executable, '-c', reader, ref.json()],
+                                    capture_output=True, check=True,
+                                    cwd=Path(__file__).parent.parent.parent)
+            assert result.stdout == mapping_content
+            assert b'leaked' not in result.stderr
+
+        # the segment outlives the reader processes
+        assert writer.resolve(ref) == mapping_content
+
+def test_close_unlinks_segments_with_live_views():
+    buffers = SharedMemoryBuffers()
+    first = buffers.put(b'first')
+    second = buffers.put(b'second')
+    view = buffers.resolve(first)
+
+    with pytest.raises(BufferError):
+        buffers.close()
+    view.release()
+
+    for ref in (first, second):
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=ref.shm_name)
+
+    with pytest.raises(KeyError):
+        with SharedMemoryBuffers() as buffers:
+            view = buffers.resolve(buffers.put(b'payload'))
+            raise KeyError('payload')
+    view.release()
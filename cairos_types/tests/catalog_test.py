@@ -0,0 +1,73 @@
+import datetime
+import tempfile
+from pathlib import Path
+from typing import Generator, Any
+import pytest
+
+from cairos_types.catalog import MotionCatalog, _SNAPSHOT_FIELDS
+from cairos_types.core import Motion, Motions
+
+@pytest.fixture(scope='module')
+def temp_paths() -> Generator[list[Path], Any, Any]:
+    with tempfile.NamedTemporaryFile(suffix=".bgeo") as run, \
+         tempfile.NamedTemporaryFile(suffix=".bgeo") as sneak, \
+         tempfile.NamedTemporaryFile(suffix=".bgeo") as jump:
+        yield [Path(run.name), Path(sneak.name), Path(jump.name)]
+
+@pytest.fixture
+def motions(temp_paths: list[Path]) -> Motions:
+    data = [
+        (1, 'Running fast', 'Chase scene', ['run', 'outdoor'], datetime.datetime(2025, 6, 1)),
+        (2, 'Sneaky Look Around', 'Sneaking session', ['sneaky'], datetime.datetime(2025, 6, 9)),
+        (3, 'Jumping over fence', 'Chase scene', ['jump', 'outdoor'], datetime.datetime(2025, 6, 5)),
+    ]
+    return Motions(key='test', entries=[
+        Motion(sg_id=sg_id,
+               description=description,
+               input=str(path),
+               shot_description=shot,
+               tags=tags,
+               created_at=created_at)
+        for (sg_id, description, shot, tags, created_at), path in zip(data, temp_paths)])
+
+def test_snapshot_fields_match_motion():
+    assert set(_SNAPSHOT_FIELDS) == set(Motion.__fields__)
+
+def test_catalog_lookup(motions: Motions):
+    catalog = MotionCatalog.from_motions(motions)
+
+    assert len(catalog) == 3
+    assert catalog.get(2).description == 'Sneaky Look Around'
+    assert catalog.get(4) is None
+    assert [m.sg_id for m in catalog.search('chase scene')] == [1, 3]
+    assert [m.sg_id for m in catalog.search('outdoor jump')] == [3]
+    assert [m.sg_id for m in catalog.search('sne', prefix=True)] == [2]
+    assert [m.sg_id for m in catalog.search_prefix('ju')] == [3]
+    assert catalog.search('swimming') == []
+    assert [m.sg_id for m in catalog.created_between(datetime.datetime(2025, 6, 2))] == [3, 2]
+
+def test_catalog_incremental_updates(motions: Motions):
+    catalog = MotionCatalog.from_motions(motions)
+    catalog.remove(3)
+
+    assert catalog.search('jumping') == []
+    assert catalog.search_prefix('fen') == []
+    assert [m.sg_id for m in catalog.search('outdoor')] == [1]
+
+    replacement = motions.entries[0].copy(update={'description': 'Walking slowly'})
+    catalog.add(replacement)
+
+    assert len(catalog) == 2
+    assert catalog.search('running') == []
+    assert catalog.search('walking')[0] is replacement
+
+    with pytest.raises(KeyError):
+        catalog.remove(3)
+
+def test_catalog_snapshot(motions: Motions):
+    catalog = MotionCatalog.from_motions(motions)
+    restored = MotionCatalog.from_snapshot(catalog.to_snapshot())
+
+    assert restored.key == catalog.key
+    assert restored.to_motions() == motions
+    assert [m.sg_id for m in restored.search('chase')] == [1, 3]
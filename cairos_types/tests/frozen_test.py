@@ -0,0 +1,131 @@
+import datetime
+import functools
+from pathlib import Path
+import pytest
+
+from cairos_types.core import Animation, Motion
+from cairos_types.frozen import FrozenModel, freeze, frozen_variant, thaw
+from cairos_types.houdini import Context, RetargetOutput
+
+@pytest.fixture(scope='module')
+def existing_file() -> Path:
+    return Path(Path(__file__).parent.parent.parent , 'pyproject.toml')
+
+@pytest.fixture
+def motion(existing_file: Path) -> Motion:
+    return Motion(
+        sg_id=1,
+        description='Running',
+        input=str(existing_file),
+        shot_description="This is a test shot",
+        tags=['run'],
+        created_at=datetime.datetime(2025, 6, 9))
+
+def test_freeze_is_zero_copy_and_immutable(motion: Motion):
+    frozen = freeze(motion)
+
+    assert isinstance(frozen, Motion)
+    assert isinstance(frozen, FrozenModel)
+    assert type(frozen) is frozen_variant(Motion)
+    assert frozen.tags is not motion.tags
+    assert freeze(frozen) is frozen
+
+    with pytest.raises(TypeError):
+        frozen.description = 'Walking'
+
+def test_original_cannot_modify_frozen(motion: Motion):
+    expected = freeze(motion.copy(deep=True))
+    frozen = freeze(motion)
+    hash(frozen)
+
+    motion.description = 'Walking'
+    motion.tags.append('walk')
+
+    assert frozen.description == 'Running'
+    assert frozen.tags == ['run']
+    assert frozen == expected
+    assert hash(frozen) == hash(expected)
+
+def test_freeze_nested_models(existing_file: Path):
+    wrapper = RetargetOutput(output_bgeo=Path('a.bgeo.sc'), output_gltf=Path('a.glb'))
+    animation = Animation(sequence=[Motion(sg_id=1,
+                                           description='Running',
+                                           input=str(existing_file),
+                                           shot_description='Nested',
+                                           created_at=datetime.datetime(2025, 6, 9))],
+                          description='Nested')
+    frozen = freeze(animation)
+
+    assert isinstance(frozen.sequence[0], FrozenModel)
+    with pytest.raises(TypeError):
+        frozen.sequence[0].description = 'Walking'
+
+    animation.sequence[0].description = 'Walking'
+    assert frozen.sequence[0].description == 'Running'
+    assert type(animation.sequence[0]) is Motion
+    assert freeze(wrapper) == freeze(wrapper.copy())
+
+    thawed = thaw(frozen)
+    assert type(thawed.sequence[0]) is Motion
+    thawed.sequence[0].description = 'Jumping'
+    assert frozen.sequence[0].description == 'Running'
+
+def test_references_from_before_freeze(existing_file: Path):
+    motion = Motion(sg_id=1,
+                    description='Running',
+                    input=str(existing_file),
+                    shot_description='References',
+                    tags=['run'],
+                    created_at=datetime.datetime(2025, 6, 9))
+    animation = Animation(sequence=[motion], description='References')
+    sequence = animation.sequence
+    tags = motion.tags
+
+    frozen = freeze(animation)
+    expected_hash = hash(frozen)
+
+    assert sequence is animation.sequence
+    assert sequence is not frozen.sequence
+    assert type(sequence[0]) is Motion
+
+    sequence.append(motion.copy())
+    tags.append('fast')
+
+    assert len(frozen.sequence) == 1
+    assert frozen.sequence[0].tags == ['run']
+    assert hash(frozen) == expected_hash
+    assert hash(frozen) == hash(freeze(Animation(sequence=[motion.copy(update={'tags': ['run']})],
+                                                 description='References')))
+
+def test_frozen_hash_and_equality(motion: Motion):
+    frozen = freeze(motion)
+    other = freeze(motion.copy(deep=True))
+    different = freeze(motion.copy(update={'sg_id': 2}))
+
+    assert hash(frozen) == hash(other)
+    assert frozen == other
+    assert frozen == motion
+    assert frozen != different
+    assert len({frozen, other, different}) == 2
+
+def test_frozen_models_as_cache_keys(motion: Motion):
+    calls = []
+
+    @functools.lru_cache
+    def describe(m: Motion, context: Context) -> str:
+        calls.append(m)
+        return f'{context.username}: {m.description}'
+
+    context = freeze(Context(username='tester'))
+    describe(freeze(motion), context)
+    describe(freeze(motion.copy(deep=True)), freeze(Context(username='tester')))
+
+    assert len(calls) == 1
+
+def test_thaw(motion: Motion):
+    thawed = thaw(freeze(motion))
+
+    assert type(thawed) is Motion
+    assert thawed == motion
+    thawed.description = 'Walking'
+    assert motion.description == 'Running'
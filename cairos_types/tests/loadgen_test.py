@@ -0,0 +1,55 @@
+import pytest
+
+from cairos_types import loadgen
+from cairos_types.loadgen import JOB_TYPES, STAGES, LoadGeneratorConfig, run_load
+
+def small_config(**kwargs) -> LoadGeneratorConfig:
+    values = dict(requests=len(JOB_TYPES) * 4,
+                  concurrency=4,
+                  workers=2,
+                  motions_max=5,
+                  avatar_size=1024,
+                  seed=7)
+    values.update(kwargs)
+    return LoadGeneratorConfig(**values)
+
+def test_run_load_every_job_type():
+    config = small_config(error_rate=0.0)
+    report = run_load(config)
+
+    assert report.requests == config.requests
+    assert report.errors == 0
+    assert sum(report.per_job_type.values()) == config.requests
+    assert set(report.per_job_type) <= set(JOB_TYPES)
+    assert list(report.stages) == list(STAGES)
+    assert report.stages['latency'].count == config.requests
+    assert report.stages['latency'].p99 >= report.stages['latency'].p50
+    assert report.throughput > 0
+    assert 'req/s' in report.format()
+
+def test_run_load_errors():
+    config = small_config(error_rate=1.0)
+    report = run_load(config)
+
+    assert report.errors == config.requests
+
+def test_run_load_worker_failure(monkeypatch: pytest.MonkeyPatch):
+    def failing_success(job_type, request):
+        raise RuntimeError('mock failure')
+
+    monkeypatch.setattr(loadgen, 'mock_success', failing_success)
+    config = small_config(error_rate=0.0, response_timeout=10)
+    report = run_load(config)
+
+    assert report.errors == config.requests
+
+@pytest.mark.parametrize('values', [
+    {'concurrency': 0},
+    {'workers': 0},
+    {'motions_min': 5, 'motions_max': 2},
+    {'error_rate': 1.5},
+    {'error_rate': -0.1},
+])
+def test_config_validation(values: dict):
+    with pytest.raises(ValueError):
+        LoadGeneratorConfig(**values)
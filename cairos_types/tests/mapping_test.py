@@ -0,0 +1,54 @@
+import tempfile
+from pathlib import Path
+from typing import Generator, Any, get_args
+import pytest
+
+from cairos_types.houdini import AvatarPreset
+from cairos_types.mapping import PRESETS, MappingResolver
+from cairos_types.skeleton import CairosWorkSkelMapping
+
+@pytest.fixture(scope='module')
+def mapping_content() -> bytes:
+    values = {name: f'rig_{name}' for name in CairosWorkSkelMapping.__fields__}
+    return CairosWorkSkelMapping(**values).json().encode()
+
+@pytest.fixture(scope='module')
+def mapping_file(mapping_content: bytes) -> Generator[Path, Any, Any]:
+    with tempfile.NamedTemporaryFile(suffix='.json') as f:
+        f.write(mapping_content)
+        f.flush()
+        yield Path(f.name)
+
+def test_every_preset_has_a_table():
+    assert set(PRESETS) == set(get_args(AvatarPreset))
+
+def test_resolve_preset():
+    resolver = MappingResolver()
+    compiled = resolver.resolve('mixamo')
+
+    assert resolver.resolve('mixamo') is compiled
+    assert compiled.to_mapping().LeftHandMid1 == 'mixamorig:LeftHandMiddle1'
+    assert compiled.to_mapping().Reference == ''
+
+    with pytest.raises(ValueError):
+        resolver.resolve('unknown')
+
+def test_resolve_content_is_memoized(mapping_content: bytes, mapping_file: Path):
+    resolver = MappingResolver()
+    from_bytes = resolver.resolve(mapping_content)
+    from_file = resolver.resolve(mapping_file)
+
+    assert from_file is from_bytes
+    assert hash(from_file) == hash(from_bytes)
+    assert from_file.to_mapping() == CairosWorkSkelMapping.parse_raw(mapping_content)
+    assert resolver.cache_info().hits == 1
+    assert resolver.cache_info().misses == 1
+
+def test_resolve_content_eviction(mapping_content: bytes):
+    resolver = MappingResolver(maxsize=1)
+    first = resolver.resolve(mapping_content)
+    resolver.resolve(mapping_content.replace(b'rig_Hips', b'other_Hips'))
+
+    assert resolver.cache_info().currsize == 1
+    assert resolver.resolve(mapping_content) is not first
+    assert resolver.resolve(mapping_content) == first
@@ -0,0 +1,39 @@
+from uuid import uuid4
+
+from cairos_types.node_errors import HoudiniErrorStore
+
+def test_error_store_round_trip():
+    store = HoudiniErrorStore()
+    errors = {
+        '/obj/sequencer/merge1': ['Invalid input', 'Cook failed'],
+        '/obj/sequencer/output': [],
+    }
+    job_ids = [('sequencer', uuid4()) for _ in range(3)]
+    store.add(job_ids[0], errors)
+    store.add(job_ids[1], None)
+    store.add(job_ids[2], {})
+
+    assert store.get(job_ids[0]) == errors
+    assert list(store.get(job_ids[0])) == list(errors)
+    assert store.get(job_ids[1]) is None
+    assert store.get(job_ids[2]) == {}
+    assert len(store) == 3
+
+def test_error_store_interning_and_queries():
+    store = HoudiniErrorStore()
+    for i in range(10):
+        errors = {'/obj/retarget/ik': ['Missing joint'],
+                  '/obj/sequencer/merge1': ['Cook failed']}
+        if i >= 7:
+            errors['/obj/sequencer/blend'] = ['Cook failed', 'Invalid input']
+        store.add(i, errors)
+
+    assert store.node_count == 3
+    assert store.message_count == 3
+    assert store.top_failing_nodes() == [('/obj/retarget/ik', 10),
+                                         ('/obj/sequencer/merge1', 10),
+                                         ('/obj/sequencer/blend', 3)]
+    assert store.top_failing_nodes('/obj/sequencer', last_n=2) == [('/obj/sequencer/merge1', 2),
+                                                                    ('/obj/sequencer/blend', 2)]
+    assert store.top_failing_nodes('/obj/seq') == []
+    assert store.top_messages('/obj/sequencer', last_n=3, k=1) == [('Cook failed', 6)]
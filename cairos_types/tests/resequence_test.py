@@ -0,0 +1,70 @@
+import datetime
+import tempfile
+from pathlib import Path
+from typing import Generator, Any
+import pytest
+
+from cairos_types.core import Motion
+from cairos_types.houdini import SegmentReuse
+from cairos_types.resequence import SegmentCache, diff_animations
+
+@pytest.fixture(scope='module')
+def temp_paths() -> Generator[list[Path], Any, Any]:
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [Path(directory, f'segment_{i}.bgeo.sc') for i in range(4)]
+        for path in paths:
+            path.touch()
+        yield paths
+
+@pytest.fixture(scope='module')
+def motions(temp_paths: list[Path]) -> list[Motion]:
+    created_at = datetime.datetime(2025, 6, 9)
+    return [Motion(sg_id=i,
+                   description=f'Motion {i}',
+                   input=str(temp_paths[i]),
+                   shot_description='Resequence test',
+                   created_at=created_at) for i in range(4)]
+
+def test_diff_animations(motions: list[Motion]):
+    edited = motions[:2] + [motions[3], motions[2]]
+    diff = diff_animations(motions, edited)
+
+    assert diff.prefix_length == 2
+    assert diff.matching_segments[0] == (0, 0, 2)
+    assert 0 not in diff.changed and 1 not in diff.changed
+
+    same = diff_animations(motions, motions)
+    assert same.unchanged
+    assert same.prefix_length == 4
+
+    removed = diff_animations(motions, motions[:1] + motions[2:])
+    assert removed.prefix_length == 1
+    assert removed.changed == ()
+    assert removed.removed == (1,)
+    assert not removed.unchanged
+
+def test_segment_cache_plan(motions: list[Motion], temp_paths: list[Path]):
+    cache = SegmentCache(cache_id='job-1')
+    cache.store(motions, temp_paths)
+
+    edited = motions[:3] + [motions[0]]
+    reuse = cache.plan(edited)
+
+    assert isinstance(reuse, SegmentReuse)
+    assert reuse.cache_id == 'job-1'
+    assert reuse.segments == temp_paths[:3]
+    assert cache.plan(motions[1:]) is None
+
+    cache.evict(edited)
+    assert len(cache.segments) == 3
+
+def test_segment_cache_requires_identical_prefix(motions: list[Motion], temp_paths: list[Path]):
+    a, b, c, x = motions
+    cache = SegmentCache(cache_id='job-2')
+    cache.store([a, b, x], temp_paths[:3])
+    cache.store([a, c, x], [temp_paths[0], temp_paths[3], temp_paths[1]])
+
+    # `x` was cooked after [a, b] and after [a, c], but never after [a, b, c]
+    assert cache.plan([a, b, c]).segments == temp_paths[:2]
+    assert cache.plan([a, c, x]).segments == [temp_paths[0], temp_paths[3], temp_paths[1]]
+    assert cache.plan([b, a]) is None
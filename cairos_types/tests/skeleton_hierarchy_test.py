@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from cairos_types.skeleton import (CairosWorkSkelMapping,
+                                   CairosWorkSkelJoint,
+                                   SkeletonHierarchy,
+                                   WORK_SKEL_HIERARCHY,
+                                   compose_transforms)
+
+def test_work_skeleton_hierarchy():
+    hierarchy = CairosWorkSkelMapping.hierarchy
+
+    assert hierarchy is WORK_SKEL_HIERARCHY
+    assert hierarchy.parents[CairosWorkSkelJoint.Reference] == -1
+    assert hierarchy.parents[CairosWorkSkelJoint.Head] == CairosWorkSkelJoint.Neck
+    assert hierarchy.chains['LeftUpLeg'] == (CairosWorkSkelJoint.LeftUpLeg,
+                                             CairosWorkSkelJoint.LeftLeg,
+                                             CairosWorkSkelJoint.LeftFoot,
+                                             CairosWorkSkelJoint.LeftToeBase)
+    assert len(hierarchy.segments) == len(CairosWorkSkelJoint) - 1
+
+    position = {joint: i for i, joint in enumerate(hierarchy.topological_order.tolist())}
+    for parent, child in hierarchy.segments.tolist():
+        assert position[parent] < position[child]
+
+def test_hierarchy_cycle():
+    with pytest.raises(ValueError):
+        SkeletonHierarchy(['a', 'b'], [1, 0])
+
+def test_forward_kinematics():
+    frames = 3
+    joints = len(CairosWorkSkelJoint)
+    rotations = np.broadcast_to(np.eye(3), (frames, joints, 3, 3))
+    translations = np.zeros((frames, joints, 3))
+    translations[..., 1] = 1.0
+    # rotate the neck by 90 degrees around z on the last frame
+    rotations = rotations.copy()
+    rotations[2, CairosWorkSkelJoint.Neck] = [[0, -1, 0], [1, 0, 0], [0, 0, 1]]
+
+    positions = WORK_SKEL_HIERARCHY.world_positions(compose_transforms(rotations, translations))
+
+    assert positions.shape == (frames, joints, 3)
+    assert np.allclose(positions[0, CairosWorkSkelJoint.Head], [0, 8, 0])
+    assert np.allclose(positions[2, CairosWorkSkelJoint.Head], [-1, 7, 0])
+    assert np.allclose(positions[:, CairosWorkSkelJoint.LeftToeBase], [0, 6, 0])
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from cairos_types.skeleton import (CairosWorkSkelMapping,
+                                   CairosWorkSkelJoint,
+                                   CairosWorkSkelIndexMapping,
+                                   WORK_SKEL_JOINT_COUNT)
+
+@pytest.fixture(scope='module')
+def mapping() -> CairosWorkSkelMapping:
+    values = {name: f'mixamorig:{name}' for name in CairosWorkSkelMapping.__fields__}
+    values['Reference'] = ''
+    values['Spine3'] = ''
+    return CairosWorkSkelMapping(**values)
+
+def test_joint_enumeration_order():
+    assert [j.name for j in CairosWorkSkelJoint] == list(CairosWorkSkelMapping.__fields__)
+    assert CairosWorkSkelJoint.LeftHandPalm == 0
+    assert WORK_SKEL_JOINT_COUNT == 54
+
+def test_index_mapping_round_trip(mapping: CairosWorkSkelMapping):
+    index_mapping = CairosWorkSkelIndexMapping.from_mapping(mapping)
+
+    assert index_mapping.indices[CairosWorkSkelJoint.Reference] == -1
+    assert index_mapping.indices[CairosWorkSkelJoint.Spine3] == -1
+    assert index_mapping.to_mapping() == mapping
+
+def test_index_mapping_unknown_joint(mapping: CairosWorkSkelMapping):
+    with pytest.raises(ValueError):
+        CairosWorkSkelIndexMapping.from_mapping(mapping, user_joints=['mixamorig:Hips'])
+
+def test_index_mapping_remap(mapping: CairosWorkSkelMapping):
+    user_joints = ['mixamorig:Head', 'extra_joint', 'mixamorig:Hips'] + \
+        [v for v in mapping.dict().values() if v not in ('', 'mixamorig:Head', 'mixamorig:Hips')]
+    index_mapping = CairosWorkSkelIndexMapping.from_mapping(mapping, user_joints)
+
+    frames = np.arange(2 * len(user_joints) * 3, dtype=np.float32)\
+        .reshape(2, len(user_joints), 3) + 1
+    remapped = index_mapping.remap(frames, fill_value=-1)
+
+    assert remapped.shape == (2, WORK_SKEL_JOINT_COUNT, 3)
+    assert (remapped[:, CairosWorkSkelJoint.Head] == frames[:, 0]).all()
+    assert (remapped[:, CairosWorkSkelJoint.Hips] == frames[:, 2]).all()
+    assert (remapped[:, CairosWorkSkelJoint.Reference] == -1).all()